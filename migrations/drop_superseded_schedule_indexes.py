@@ -0,0 +1,36 @@
+import sys
+from pathlib import Path
+import logging
+
+# Add project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+# Now we can import from src
+from src.db.db_schema import RinDB
+
+logger = logging.getLogger(__name__)
+
+# Indexes on rin.scheduled_operations replaced by the partial upcoming_schedules index
+SUPERSEDED_SCHEDULE_INDEXES = ("status_1_scheduled_time_1", "status_1")
+
+async def drop_superseded_schedule_indexes(db: RinDB):
+    """Drop scheduled operation indexes superseded by upcoming_schedules"""
+    try:
+        existing = await db.scheduled_operations.index_information()
+
+        # Servers older than MongoDB 6.0 keep the full index as their only (status, scheduled_time) index
+        if "upcoming_schedules" not in existing:
+            logger.info("No upcoming_schedules index found, keeping status_1_scheduled_time_1")
+            existing.pop("status_1_scheduled_time_1", None)
+
+        for name in SUPERSEDED_SCHEDULE_INDEXES:
+            if name in existing:
+                await db.scheduled_operations.drop_index(name)
+                logger.info(f"Dropped {name} index from {db.scheduled_operations.name}")
+            else:
+                logger.info(f"No {name} index found, skipping")
+
+    except Exception as e:
+        logger.error(f"Error dropping superseded schedule indexes: {e}")
+        raise
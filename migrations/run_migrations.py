@@ -17,6 +17,7 @@ from migrations.align_tweet_schema import (
     migrate_tweet_schedules_to_scheduled_operations,
     cleanup_old_collections
 )
+from migrations.drop_superseded_schedule_indexes import drop_superseded_schedule_indexes
 from src.utils.logging_config import setup_logging
 
 # Set up logging
@@ -35,6 +36,7 @@ async def run_migrations(mongo_uri: str):
         await migrate_to_tool_items(db)
         await migrate_tweet_schedules_to_scheduled_operations(db)
         await cleanup_old_collections(db)
+        await drop_superseded_schedule_indexes(db)
         
         logger.info("Migrations completed successfully")
         
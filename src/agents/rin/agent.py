@@ -15,7 +15,10 @@ import logging
 from pathlib import Path
 from typing import Dict, Optional, List, Any, Union
 from datetime import datetime, UTC
-import json
+import re
+from collections import OrderedDict, deque
+from functools import lru_cache
+import tiktoken
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -28,24 +31,90 @@ sys.path.insert(0, str(project_root))
 from src.services.llm_service import LLMService, ModelType
 from src.agents.rin.context_manager import RinContext
 from src.agents.rin.prompts import SYSTEM_PROMPT
-from src.graphrag.rin_engine import RinResponseEnricher
-from src.tools.orchestrator import Orchestrator
 from src.utils.trigger_detector import TriggerDetector
 from src.managers.tool_state_manager import ToolStateManager, ToolOperationState
 from src.tools.base import AgentDependencies
 from src.db.mongo_manager import MongoManager
-from src.services.schedule_service import ScheduleService
 from src.managers.agent_state_manager import AgentStateManager
 from src.db.enums import AgentState
-from src.services.monitoring_service import LimitOrderMonitoringService
+
+# Single-pass text cleanup tables (avoid chained str.replace rescans)
+_TTS_DELETE_TABLE = str.maketrans('', '', '*_`~()<>')
+_CLEANUP_RE = re.compile(r'<</?(?:SYS|CONTEXT|RAG)>>|\]')
+
+@lru_cache(maxsize=1)
+def _get_encoder() -> tiktoken.Encoding:
+    """Shared BPE encoder for token counting (loaded once per process)"""
+    return tiktoken.get_encoding("cl100k_base")
+
+# GraphRAG enrichers shared across agents, keyed by (uri, username), so each
+# Neo4j account gets one driver/connection pool per process. The enricher is
+# only cleaned up once the last agent using it releases it.
+_ENRICHER_CACHE: Dict[tuple, Any] = {}
+_ENRICHER_USERS: Dict[tuple, int] = {}
+
+def _acquire_enricher(key: tuple, uri: str, username: str, password: str) -> Any:
+    """Get the shared enricher for a Neo4j account and register one more user"""
+    enricher = _ENRICHER_CACHE.get(key)
+    if enricher is None:
+        # Imported here for the same reason as RinAgent.__init__'s service imports
+        from src.graphrag.rin_engine import RinResponseEnricher
+        enricher = RinResponseEnricher(uri=uri, username=username, password=password)
+        _ENRICHER_CACHE[key] = enricher
+    _ENRICHER_USERS[key] = _ENRICHER_USERS.get(key, 0) + 1
+    return enricher
+
+def _release_enricher(key: tuple, enricher: Any) -> bool:
+    """Drop one user of a shared enricher; True when it was the last and should be cleaned up"""
+    if _ENRICHER_CACHE.get(key) is not enricher:
+        return False
+    remaining = _ENRICHER_USERS.get(key, 1) - 1
+    if remaining > 0:
+        _ENRICHER_USERS[key] = remaining
+        return False
+    del _ENRICHER_CACHE[key]
+    _ENRICHER_USERS.pop(key, None)
+    return True
+
+# Interaction types whose responses are spoken through TTS
+_TTS_INTERACTION_TYPES = frozenset({"local_agent", "livestream"})
+
+# End of a sentence in a streamed reply (punctuation followed by whitespace)
+_SENTENCE_END_RE = re.compile(r'[.!?~]+\s+')
+
+def _clean_inst_tokens(text: str) -> str:
+    """Strip leftover instruction format tokens from model output"""
+    return text.replace("[/INST]", "").replace("[INST]", "")
+
+def _split_partial_inst_token(text: str) -> tuple:
+    """Split cleaned streamed text into (ready, held), holding back a trailing
+    partial instruction token that the next delta may complete"""
+    start = text.rfind("[")
+    if start != -1 and ("[/INST]".startswith(text[start:]) or "[INST]".startswith(text[start:])):
+        return text[:start], text[start:]
+    return text, ""
 
 class RinAgent:
+    # Cap on in-memory sessions; evicted sessions are rehydrated from MongoDB
+    MAX_SESSIONS = 1024
+    # In-memory messages kept per session (MongoDB remains the source of truth)
+    SESSION_HISTORY_LIMIT = 40
+    # Prompts larger than this (in chars) are assembled off the event loop
+    PROMPT_OFFLOAD_CHARS = 20_000
+
     def __init__(self, mongo_uri: str):
         """Initialize Rin agent with required services."""
+        # Heavy service modules (Neo4j, tool SDKs) are imported on construction
+        # so importing this module stays cheap; see also _acquire_enricher
+        from src.tools.orchestrator import Orchestrator
+        from src.services.schedule_service import ScheduleService
+        from src.services.monitoring_service import LimitOrderMonitoringService
+
         self.llm_service = LLMService()
         self.context_manager = RinContext(mongo_uri)
         self.mongo_uri = mongo_uri
-        self.sessions = {}
+        self.sessions = OrderedDict()  # LRU ordered, see _touch_session
+        self._background_tasks = set()  # In-flight fire-and-forget writes, see _spawn
         
         # Initialize trigger detector
         self.trigger_detector = TriggerDetector()
@@ -58,8 +127,10 @@ class RinAgent:
         if not all([self.neo4j_uri, self.neo4j_username, self.neo4j_password]):
             logger.warning("Neo4j credentials not fully configured. GraphRAG will be disabled.")
         
-        # Initialize response enricher with Neo4j config
-        self.response_enricher = RinResponseEnricher(
+        # Initialize response enricher with Neo4j config (shared per account)
+        self._enricher_key = (self.neo4j_uri, self.neo4j_username)
+        self.response_enricher = _acquire_enricher(
+            self._enricher_key,
             uri=self.neo4j_uri,
             username=self.neo4j_username,
             password=self.neo4j_password
@@ -73,6 +144,34 @@ class RinAgent:
         self.tool_model = ModelType.CLAUDE_3_5_SONNET # For tool-based responses
         # add role playing model
 
+        # Static system message, byte-identical across turns so providers can
+        # reuse its prefix cache (explicit cache_control for Claude, automatic
+        # prefix matching elsewhere). Per-turn content goes in the user message.
+        self._system_message = {
+            "role": "system",
+            "content": (
+                f"{SYSTEM_PROMPT}\n\n"
+                "RESPONSE GUIDELINES:\n"
+                "- If tool results are available, incorporate them naturally into your response\n"
+                "- Focus on directly addressing the user's message\n"
+                "- Only reference personality traits if naturally relevant\n"
+                "- Match user's emotional tone and engagement level\n"
+                "- Keep responses natural and contextual\n"
+                "- If you are unable to answer the user's question, say so concisely (1-2 sentences)\n"
+                "- Tool results are RARE and very valuable - use them to make your responses accurate and helpful"
+            ),
+            "cache_control": {"type": "ephemeral"}
+        }
+
+        # Static fragments of the per-turn user message
+        self._prompt_prefix = "CONTEXT LAYERS:\n- MEMORY GUIDANCE\n"
+        self._prompt_mid_a = "\n\n- RECENT CONVERSATION\n"
+        self._prompt_mid_b = (
+            "\n\n- TOOL RESULTS: You have access to real-time data and reasoning tools. "
+            "IMPORTANT: You MUST use the data in your response:\n"
+        )
+        self._prompt_suffix = "\n\n[INST] "
+
         # Add ScheduleService initialization
         self.schedule_service = ScheduleService(mongo_uri)
         
@@ -115,7 +214,8 @@ class RinAgent:
                 logger.info("GraphRAG engine initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to initialize GraphRAG engine: {e}")
-                # Continue initialization but disable GraphRAG
+                # Continue initialization but disable GraphRAG for this agent
+                _release_enricher(self._enricher_key, self.response_enricher)
                 self.response_enricher = None
             
             # Initialize orchestrator
@@ -170,118 +270,171 @@ class RinAgent:
     async def get_response(self, session_id: str, message: str, role: str = "user", interaction_type: str = "local_agent") -> str:
         """Main entry point for message processing"""
         try:
-            logger.info(f"[AGENT] Processing message for session {session_id}")
+            logger.info("[AGENT] Processing message for session %s", session_id)
+
+            turn = await self._prepare_turn(session_id, message)
+            if "response" in turn:
+                return turn["response"]
+
+            # Generate final response
+            response = await self._generate_response(
+                message=message,
+                session=turn["session"],
+                session_id=session_id,
+                context=turn["context"],
+                tool_results=turn["tool_results"],
+                rag_guidance=turn["rag_guidance"],
+                role=role,
+                interaction_type=interaction_type
+            )
+
+            # Persist in the background, as stream_response does
+            self._spawn(self._store_interaction(
+                session_id,
+                message,
+                response,
+                metadata={'formatted_for_tts': interaction_type in _TTS_INTERACTION_TYPES}
+            ))
             
-            # Initialize session if needed
-            if session_id not in self.sessions:
-                await self.start_new_session(session_id)
+            return response
 
-            # Let state manager handle the message first
-            try:
-                state_result = await self.state_manager.handle_agent_state(
-                    message=message,
-                    session_id=session_id
-                )
-                
-                if state_result.get("error"):
-                    logger.error(f"State manager error: {state_result['error']}")
-                    return "Gomen ne~ I had a little technical difficulty! (⌒_⌒;)"
-
-                # If we have a response from state manager, use it
-                if state_result.get("response"):
-                    # Store the interaction with state metadata
-                    await self._store_interaction(
-                        session_id=session_id,
-                        message=message,
-                        response=state_result["response"],
-                        metadata={
-                            'state': state_result.get('state'),
-                            'tool_type': state_result.get('tool_type')
-                        }
-                    )
-                    return state_result["response"]
-
-                # If no response but we're in TOOL_OPERATION, wait for tool result
-                if self.state_manager.current_state == AgentState.TOOL_OPERATION:
-                    logger.info("[AGENT] Waiting for tool operation result...")
-                    return "Processing your request..."
+        except Exception as e:
+            logger.error(f"[ERROR] Failed to generate response: {e}", exc_info=True)
+            return "I encountered an error processing your request. Can I help you with something else?"
 
-            except Exception as e:
-                logger.error(f"Error in state management: {e}", exc_info=True)
-                return "Gomen ne~ I had a little technical difficulty! (⌒_⌒;)"
-
-            # Only proceed with normal chat if we're in NORMAL_CHAT state
-            if self.state_manager.current_state == AgentState.NORMAL_CHAT:
-                # Get conversation history
-                history = await self.context_manager.get_combined_context(session_id, message)
-                if history:
-                    self.sessions[session_id]['messages'] = history
-
-            # Continue with normal chat flow only if no tool operation is active
-            if self.state_manager.current_state == AgentState.NORMAL_CHAT:
-                # 1. Check for tool triggers first
-                tool_type = self.trigger_detector.get_specific_tool_type(message)
-                if tool_type:
-                    logger.info(f"[TOOLS] Detected tool type: {tool_type}")
-                    try:
-                        # Use handle_tool_operation instead of process_command
-                        result = await self.orchestrator.handle_tool_operation(
-                            message=message,
-                            session_id=session_id,
-                            tool_type=tool_type
-                        )
-                        
-                        if result and isinstance(result, dict):
-                            response = result.get("response")
-                            if response:
-                                await self._store_interaction(
-                                    session_id=session_id,
-                                    message=message,
-                                    response=response,
-                                    metadata={
-                                        'tool_type': tool_type,
-                                        'operation_state': result.get('state')
-                                    }
-                                )
-                                return response
-                                
-                    except Exception as e:
-                        logger.error(f"[TOOLS] Error in tool operation: {e}")
-                        return "Gomen ne~ I had a little technical difficulty! (⌒_⌒;)"
-                
-                # 2. Check for memory/RAG triggers
-                use_memory = self.trigger_detector.should_use_memory(message)
-                rag_guidance = None
-                if use_memory and self.response_enricher:
-                    try:
-                        rag_guidance = await self.response_enricher.enrich_response(message)
-                        logger.info(f"Memory guidance received: {rag_guidance[:100]}...")
-                    except Exception as e:
-                        logger.warning(f"Memory lookup failed: {e}")
-                        rag_guidance = "Consider this a fresh conversation."
-
-                # 3. Generate final response
-                # If tool operation completed successfully, use its results
-                tool_results = result.get("tool_results") if result.get("status") == "completed" else None
-                
-                response = await self._generate_response(
-                    message=message,
-                    session=self.sessions[session_id],
+    async def stream_response(self, session_id: str, message: str, role: str = "user", interaction_type: str = "local_agent"):
+        """Streaming variant of get_response that yields the reply as it is generated"""
+        try:
+            logger.info("[AGENT] Streaming message for session %s", session_id)
+
+            turn = await self._prepare_turn(session_id, message)
+            if "response" in turn:
+                if turn["response"]:
+                    yield turn["response"]
+                return
+
+            chunks = []
+            async for chunk in self._stream_response(
+                message=message,
+                session_id=session_id,
+                context=turn["context"],
+                tool_results=turn["tool_results"],
+                rag_guidance=turn["rag_guidance"],
+                interaction_type=interaction_type
+            ):
+                chunks.append(chunk)
+                yield chunk
+
+            # Persist once the last chunk is out; the write overlaps with the caller
+            self._spawn(self._store_interaction(
+                session_id,
+                message,
+                "".join(chunks).strip(),
+                metadata={'formatted_for_tts': interaction_type in _TTS_INTERACTION_TYPES}
+            ))
+
+        except Exception as e:
+            logger.error(f"[ERROR] Failed to stream response: {e}", exc_info=True)
+            yield "I encountered an error processing your request. Can I help you with something else?"
+
+    async def _prepare_turn(self, session_id: str, message: str) -> Dict[str, Any]:
+        """Run state handling and context lookups for a message.
+
+        Returns {'response': ...} when the turn is already answered, otherwise the
+        inputs for generating a chat reply.
+        """
+        # Initialize session if needed
+        if session_id in self.sessions:
+            self._touch_session(session_id)
+        else:
+            await self.start_new_session(session_id)
+        session = self.sessions[session_id]
+
+        # Let state manager handle the message first
+        try:
+            state_result = await self.state_manager.handle_agent_state(
+                message=message,
+                session_id=session_id
+            )
+            
+            if state_result.get("error"):
+                logger.error(f"State manager error: {state_result['error']}")
+                return {"response": "Gomen ne~ I had a little technical difficulty! (⌒_⌒;)"}
+
+            # If we have a response from state manager, use it
+            if state_result.get("response"):
+                # Store the interaction with state metadata
+                await self._store_interaction(
                     session_id=session_id,
-                    tool_results=tool_results,
-                    rag_guidance=rag_guidance,
-                    role=role,
-                    interaction_type=interaction_type
+                    message=message,
+                    response=state_result["response"],
+                    metadata={
+                        'state': state_result.get('state'),
+                        'tool_type': state_result.get('tool_type')
+                    }
                 )
+                return {"response": state_result["response"]}
 
-                # 4. Store interaction
-                await self._store_interaction(session_id, message, response)
-                
-                return response
+            # If no response but we're in TOOL_OPERATION, wait for tool result
+            if self.state_manager.current_state == AgentState.TOOL_OPERATION:
+                logger.info("[AGENT] Waiting for tool operation result...")
+                return {"response": "Processing your request..."}
 
         except Exception as e:
-            logger.error(f"[ERROR] Failed to generate response: {e}", exc_info=True)
-            return "I encountered an error processing your request. Can I help you with something else?"
+            logger.error(f"Error in state management: {e}", exc_info=True)
+            return {"response": "Gomen ne~ I had a little technical difficulty! (⌒_⌒;)"}
+
+        # Continue with normal chat flow only if no tool operation is active
+        if self.state_manager.current_state != AgentState.NORMAL_CHAT:
+            return {"response": None}
+
+        # Tool triggers were already detected and dispatched by the state
+        # manager above; reaching NORMAL_CHAT here means no tool is needed.
+
+        # Fetch conversation history and memory/RAG guidance concurrently
+        # Reuses the state manager's analysis of this message
+        use_memory = self.trigger_detector.analyze(message)['use_memory']
+        lookups = [self.context_manager.get_combined_context(session_id, message)]
+        if use_memory and self.response_enricher:
+            lookups.append(self.response_enricher.enrich_response(message))
+
+        lookup_results = await asyncio.gather(*lookups, return_exceptions=True)
+
+        context = lookup_results[0]
+        if isinstance(context, Exception):
+            logger.warning("Context lookup failed: %s", context)
+            context = []
+        if context:
+            session['messages'] = deque(context, maxlen=self.SESSION_HISTORY_LIMIT)
+
+        rag_guidance = None
+        if len(lookup_results) > 1:
+            rag_guidance = lookup_results[1]
+            if isinstance(rag_guidance, Exception):
+                logger.warning("Memory lookup failed: %s", rag_guidance)
+                rag_guidance = "Consider this a fresh conversation."
+            else:
+                logger.info("Memory guidance received: %.100s...", rag_guidance)
+
+        # If the state manager's tool operation completed, use its results
+        tool_results = (
+            state_result.get("tool_results")
+            if state_result.get("status") == "completed"
+            else None
+        )
+
+        return {
+            "session": session,
+            "context": context,
+            "rag_guidance": rag_guidance,
+            "tool_results": tool_results,
+        }
+
+    def _spawn(self, coro) -> None:
+        """Run a coroutine in the background, keeping a reference until it finishes"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
 
     async def _store_interaction(self, session_id: str, message: str, response: Union[str, Dict], metadata: Optional[Dict] = None) -> None:
         """Helper to store interactions consistently"""
@@ -303,11 +456,14 @@ class RinAgent:
                 combined_metadata = metadata if metadata else {'formatted_for_tts': True}
 
             # Store in session
+            now = datetime.now(UTC)
             message_pair = [
-                {'role': 'user', 'content': message, 'timestamp': datetime.now(UTC)},
-                {'role': 'assistant', 'content': response_text, 'timestamp': datetime.now(UTC)}
+                {'role': 'user', 'content': message, 'timestamp': now},
+                {'role': 'assistant', 'content': response_text, 'timestamp': now}
             ]
-            self.sessions[session_id]['messages'].extend(message_pair)
+            session = self.sessions.get(session_id)
+            if session is not None:
+                session['messages'].extend(message_pair)
 
             # Store in database via context manager
             await self.context_manager.store_interaction(
@@ -325,21 +481,31 @@ class RinAgent:
         """Initialize a new chat session."""
         if session_id in self.sessions:
             logger.warning(f"Session {session_id} already exists")
+            self._touch_session(session_id)
             return self.sessions[session_id].get('welcome_message', "Welcome back!")
             
         self.sessions[session_id] = {
-            'created_at': datetime.utcnow(),
-            'messages': [],
+            'created_at': datetime.now(UTC),
+            'messages': deque(maxlen=self.SESSION_HISTORY_LIMIT),
             'welcome_message': "Konnichiwa!~ I'm Rin! Let's have a fun chat together! (＾▽＾)/"
         }
+        self._touch_session(session_id)
         
         return self.sessions[session_id]['welcome_message']
 
+    def _touch_session(self, session_id: str) -> None:
+        """Mark session as most recently used and evict the coldest sessions"""
+        if session_id in self.sessions:
+            self.sessions.move_to_end(session_id)
+        while len(self.sessions) > self.MAX_SESSIONS:
+            evicted_id, _ = self.sessions.popitem(last=False)
+            logger.debug("Evicted in-memory session %s", evicted_id)
+
     async def get_history(self, session_id: str) -> List[Dict[str, Any]]:
         """Retrieve chat history for given session."""
         try:
             # Get history from MongoDB instead of in-memory sessions
-            messages = await self.context_manager.get_combined_context(session_id, "")
+            messages = await self.context_manager.get_history(session_id)
             return messages
         except Exception as e:
             logger.error(f"Error retrieving history: {e}", exc_info=True)
@@ -347,18 +513,8 @@ class RinAgent:
 
     def _cleanup_response(self, response: str) -> str:
         """Clean up any formatting tokens from the response"""
-        cleanup_tokens = [
-            "]", "]",
-            "<<SYS>>", "<</SYS>>",
-            "<<CONTEXT>>", "<</CONTEXT>>",
-            "<<RAG>>", "<</RAG>>"  # In case we add RAG section markers
-        ]
-        
-        cleaned = response
-        for token in cleanup_tokens:
-            cleaned = cleaned.replace(token, "")
-            
-        return cleaned.strip()
+        # Strips "]" and <<SYS>>/<<CONTEXT>>/<<RAG>> section markers in one pass
+        return _CLEANUP_RE.sub("", response).strip()
 
     # Response formatting and generation
     async def _generate_response(
@@ -366,82 +522,141 @@ class RinAgent:
         message: str, 
         session: Dict[str, Any], 
         session_id: str,
+        context: Optional[List[Dict]] = None,
         tool_results: Optional[str] = None, 
         rag_guidance: Optional[str] = None,
         role: str = "user", 
         interaction_type: str = "local_agent"
     ) -> str:
-        try:
-            # Get conversation context
-            context = await self.context_manager.get_combined_context(session_id, message)
-            formatted_context = self._format_conversation_context(context or [])
-
-            # Choose model based on tool results
-            selected_model = (
-                self.tool_model  # Use response model if tools were used
-                if tool_results 
-                else self.chat_model  # Use chat model for regular chat
-            )
-
-            logger.info(f"Selected model: {selected_model.name} based on tool results: {bool(tool_results)}")
-
-            # Build system prompt with all available context
-            system_prompt = f"""[INST] <<SYS>>
-{SYSTEM_PROMPT}
-
-CONTEXT LAYERS:
-- MEMORY GUIDANCE
-{rag_guidance if rag_guidance else "No additional context available"}
-
-- RECENT CONVERSATION
-{formatted_context}
-
-- TOOL RESULTS: You have access to real-time data and reasoning tools. IMPORTANT: You MUST use the data in your response:
-{tool_results if tool_results else "No tool results available"}
-
-RESPONSE GUIDELINES:
-- If tool results are available, incorporate them naturally into your response
-- Focus on directly addressing the user's message
-- Only reference personality traits if naturally relevant
-- Match user's emotional tone and engagement level
-- Keep responses natural and contextual
-- If you are unable to answer the user's question, say so concisely (1-2 sentences)
-- Tool results are RARE and very valuable - use them to make your responses accurate and helpful
-<</SYS>>
-
-{message} [/INST]"""
-
-            # Single message with complete context
-            messages = [{"role": "user", "content": system_prompt}]
+        """Generate the full reply by joining the chunks of _stream_response"""
+        chunks = []
+        async for chunk in self._stream_response(
+            message=message,
+            session_id=session_id,
+            context=context,
+            tool_results=tool_results,
+            rag_guidance=rag_guidance,
+            interaction_type=interaction_type
+        ):
+            chunks.append(chunk)
+        response = "".join(chunks).strip()
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("=== RESPONSE DEBUG ===")
+            logger.debug("Response length: %d", len(response))
+            logger.debug("Response preview: %.100s...", response)
+
+        return response
+
+    async def _stream_response(
+        self,
+        message: str,
+        session_id: str,
+        context: Optional[List[Dict]] = None,
+        tool_results: Optional[str] = None,
+        rag_guidance: Optional[str] = None,
+        interaction_type: str = "local_agent"
+    ):
+        """Yield the LLM reply in cleaned-up chunks as it is generated.
 
-            logger.info("=== FINAL PROMPT DEBUG ===")
-            logger.info(f"Using model: {selected_model.name}")
-            logger.info(f"Tool results available: {bool(tool_results)}")
+        TTS channels receive whole sentences so they can be spoken while the
+        rest of the reply is still generating.
+        """
+        try:
+            if context is None:
+                context = await self.context_manager.get_combined_context(session_id, message)
+            context = context or []
 
-            # Get response from LLM
-            response = await self.llm_service.get_response(
-                prompt=messages,
-                model_type=selected_model,
+            messages, selected_model = await self._prepare_llm_messages(
+                message, context, tool_results, rag_guidance
             )
 
-            # Clean up any remaining format tokens
-            response = response.replace("[/INST]", "").replace("[INST]", "").strip()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("=== FINAL PROMPT DEBUG ===")
+                logger.debug("Using model: %s", selected_model.name)
+                logger.debug("Tool results available: %s", bool(tool_results))
+
+            for_tts = interaction_type in _TTS_INTERACTION_TYPES
+            pending = ""
+            async for delta in self.llm_service.stream_response(messages, selected_model):
+                if not for_tts:
+                    # Tokens can be split across deltas, so clean the buffered tail
+                    ready, pending = _split_partial_inst_token(_clean_inst_tokens(pending + delta))
+                    if ready:
+                        yield ready
+                    continue
+
+                pending += delta
+                # Flush every complete sentence; the tail waits for more tokens
+                boundary = None
+                for boundary in _SENTENCE_END_RE.finditer(pending):
+                    pass
+                if boundary:
+                    sentences = self._format_for_tts(_clean_inst_tokens(pending[:boundary.end()]))
+                    pending = pending[boundary.end():]
+                    if sentences:
+                        yield sentences + " "
+
+            if for_tts:
+                tail = self._format_for_tts(_clean_inst_tokens(pending))
+                if tail:
+                    yield tail
+            elif pending:
+                yield pending
 
-            # Format for TTS readability
-            tts_response = self._format_for_tts(response)
+        except Exception as e:
+            logger.error(f"Error streaming response: {e}", exc_info=True)
+            yield "Gomen ne~ I had a little technical difficulty! (⌒_⌒;)"
+
+    async def _prepare_llm_messages(
+        self,
+        message: str,
+        context: List[Dict],
+        tool_results: Optional[str],
+        rag_guidance: Optional[str]
+    ) -> tuple:
+        """Build the chat messages and pick the model for a reply"""
+        # Choose model based on tool results
+        selected_model = (
+            self.tool_model  # Use response model if tools were used
+            if tool_results 
+            else self.chat_model  # Use chat model for regular chat
+        )
 
-            logger.info("=== RESPONSE DEBUG ===")
-            logger.info(f"Response length: {len(tts_response)}")
-            logger.info(f"Response preview: {tts_response[:100]}...")
+        logger.info("Selected model: %s based on tool results: %s", selected_model.name, bool(tool_results))
 
-            # Store interaction in context manager
-            await self.context_manager.store_interaction(session_id, message, response)
+        # Build the per-turn prompt with all available context; very long inputs
+        # are formatted in a worker thread so other sessions keep progressing
+        prompt_chars = len(message) + sum(len(msg['content']) for msg in context)
+        if prompt_chars > self.PROMPT_OFFLOAD_CHARS:
+            user_prompt = await asyncio.to_thread(
+                self._build_prompt_sync, message, context, rag_guidance, tool_results
+            )
+        else:
+            user_prompt = self._build_prompt_sync(message, context, rag_guidance, tool_results)
 
-            return tts_response
+        # Cacheable static system message followed by the per-turn context
+        return [self._system_message, {"role": "user", "content": user_prompt}], selected_model
 
-        except Exception as e:
-            logger.error(f"Error generating response: {e}", exc_info=True)
-            return "Gomen ne~ I had a little technical difficulty! (⌒_⌒;)"
+    def _build_prompt_sync(
+        self,
+        message: str,
+        context: List[Dict],
+        rag_guidance: Optional[str] = None,
+        tool_results: Optional[str] = None
+    ) -> str:
+        """Assemble the per-turn user prompt (CPU-only, safe to run in a thread)"""
+        return "".join((
+            self._prompt_prefix,
+            rag_guidance if rag_guidance else "No additional context available",
+            self._prompt_mid_a,
+            self._format_conversation_context(context),
+            self._prompt_mid_b,
+            tool_results if tool_results else "No tool results available",
+            self._prompt_suffix,
+            message,
+            " [/INST]"
+        ))
 
     def _format_rag_guidance(self, enriched_context: dict) -> str:
         """Format GraphRAG guidance in Llama 2 chat style"""
@@ -467,16 +682,12 @@ RESPONSE GUIDELINES:
             return ""
         
         # Handle limiting in memory instead of at DB level
-        recent_msgs = context[-20:] if len(context) > 20 else context
-        formatted_msgs = []
+        recent_msgs = context[-20:]
         
-        for msg in recent_msgs:
-            if msg['role'] == 'user':
-                formatted_msgs.append(f"[INST] {msg['content']} [/INST]")
-            else:
-                formatted_msgs.append(msg['content'])
-            
-        return "\n".join(formatted_msgs)
+        return "\n".join(
+            f"[INST] {msg['content']} [/INST]" if msg['role'] == 'user' else msg['content']
+            for msg in recent_msgs
+        )
 
     async def _get_tool_results(self, message: str) -> Optional[str]:
         """Get results from tools based on message content"""
@@ -517,11 +728,11 @@ RESPONSE GUIDELINES:
             logger.error(f"[TOOLS] Error getting tool results: {e}", exc_info=True)
             return None
 
-    async def _estimate_token_count(self, text: str) -> int:
+    def _estimate_token_count(self, text: str) -> int:
         """Estimate token count for a given text"""
         try:
-            # Simple estimation: ~4 chars per token
-            return len(text) // 4
+            # BPE count; len(text) // 4 drifts badly for emoji/CJK text
+            return len(_get_encoder().encode(text, disallowed_special=()))
         except Exception as e:
             logger.error(f"Error estimating token count: {e}")
             return 0
@@ -529,35 +740,48 @@ RESPONSE GUIDELINES:
     async def cleanup(self):
         """Cleanup all resources"""
         try:
-            # Cleanup GraphRAG
+            # Let in-flight interaction writes finish before Mongo is closed
+            if self._background_tasks:
+                await asyncio.gather(*self._background_tasks, return_exceptions=True)
+            
+            # Independent subsystems shut down concurrently
+            shutdowns = []
+            
+            # Cleanup GraphRAG once no other agent is still using the shared enricher
             if self.response_enricher:
-                await self.response_enricher.cleanup()
+                if _release_enricher(self._enricher_key, self.response_enricher):
+                    shutdowns.append(self.response_enricher.cleanup())
                 self.response_enricher = None
             
             # Cleanup LLM service sessions
             if hasattr(self.llm_service, 'cleanup'):
-                await self.llm_service.cleanup()
+                shutdowns.append(self.llm_service.cleanup())
             
             # Cleanup orchestrator
             if hasattr(self.orchestrator, 'cleanup'):
-                await self.orchestrator.cleanup()
-            
-            # MongoDB cleanup through context manager
-            if self.context_manager:
-                await MongoManager.close()
+                shutdowns.append(self.orchestrator.cleanup())
             
             # Cleanup any remaining sessions
             for session in getattr(self, '_sessions', {}).values():
                 if hasattr(session, 'close'):
-                    await session.close()
+                    shutdowns.append(session.close())
             
             # Stop schedule service
             if hasattr(self, 'schedule_service'):
-                await self.schedule_service.stop()
+                shutdowns.append(self.schedule_service.stop())
             
             # Stop monitoring service
             if hasattr(self, 'monitoring_service'):
-                await self.monitoring_service.stop()
+                shutdowns.append(self.monitoring_service.stop())
+            
+            results = await asyncio.gather(*shutdowns, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Error during cleanup: {result}")
+            
+            # MongoDB cleanup through context manager, once nothing else needs it
+            if self.context_manager:
+                await MongoManager.close()
             
             logger.info("Successfully cleaned up all resources")
         except Exception as e:
@@ -565,15 +789,11 @@ RESPONSE GUIDELINES:
 
     def _format_for_tts(self, text: str) -> str:
         """Format text for better TTS output"""
-        # Remove markdown formatting
-        text = text.replace('*', '').replace('_', '').replace('`', '')
+        # Remove markdown formatting, tildes, parentheses and angle brackets
+        text = text.translate(_TTS_DELETE_TABLE)
         
-        # Remove emojis and special characters that might affect TTS
-        text = text.replace('~', '')  # Remove tildes
-        text = text.replace('(', '').replace(')', '')  # Remove parentheses
-        text = text.replace('>', '').replace('<', '')  # Remove angle brackets
-        text = text.replace('[]', '')  # Remove empty brackets
-        text = text.replace('{}', '')  # Remove empty braces
+        # Remove empty brackets and braces
+        text = text.replace('[]', '').replace('{}', '')
         
         # Clean up multiple spaces and newlines
         text = ' '.join(text.split())
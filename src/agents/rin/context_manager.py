@@ -64,17 +64,13 @@ class RinContext:
                 'type': interaction_type
             } if metadata else None
             
-            # Store messages with minimal metadata
-            await self.db.add_message(
+            # Store the message pair with minimal metadata in one write
+            await self.db.add_messages(
                 session_id=session_id,
-                content=user_message,
-                role='user',
-                metadata=essential_metadata
-            )
-            await self.db.add_message(
-                session_id=session_id,
-                content=assistant_response,
-                role='assistant',
+                messages=[
+                    {'role': 'user', 'content': user_message},
+                    {'role': 'assistant', 'content': assistant_response}
+                ],
                 metadata=essential_metadata
             )
         except Exception as e:
@@ -162,7 +158,7 @@ class RinContext:
             await self.db.add_context_summary(
                 session_id, 
                 summary_msg,
-                [str(msg["_id"]) for msg in retained_messages]
+                [msg["_id"] for msg in retained_messages]
             )
             
             new_total = summary_tokens + retained_token_count
@@ -222,13 +218,13 @@ class RinContext:
                                 total_tokens += len(self.enc.encode(msg['content'])) + 3
                 else:
                     # If no summary timestamp, count all messages
-                    messages = await self.db.get_session_messages(session_id)
+                    messages = await self.db.get_session_messages(session_id, fields=['content'])
                     for msg in messages:
                         total_tokens += len(self.enc.encode(msg['content'])) + 3
                 
             else:
                 # If no config exists yet, count all messages (initial state)
-                messages = await self.db.get_session_messages(session_id)
+                messages = await self.db.get_session_messages(session_id, fields=['content'])
                 for msg in messages:
                     total_tokens += len(self.enc.encode(msg['content'])) + 3
                 
@@ -246,7 +242,7 @@ class RinContext:
             
             if not context_config:
                 # No summaries yet, return full recent context
-                messages = await self.db.get_session_messages(session_id)
+                messages = await self.db.get_session_messages(session_id, fields=['role', 'content'])
                 # Handle limiting in memory
                 messages = messages[-20:] if len(messages) > 20 else messages
                 return [{"role": msg["role"], "content": msg["content"]} for msg in messages]
@@ -281,10 +277,26 @@ class RinContext:
             logger.error(f"Failed to clear session {session_id}: {e}")
             raise
 
+    async def get_history(self, session_id: str, limit: int = 100) -> List[Dict]:
+        """Get the most recent messages for display, oldest first"""
+        try:
+            cursor = self.db.messages.find(
+                {"session_id": session_id},
+                {"_id": 0, "role": 1, "content": 1, "timestamp": 1}
+            ).sort("timestamp", -1).limit(limit)
+            messages = await cursor.to_list(length=limit)
+            messages.reverse()
+            return messages
+        except Exception as e:
+            logger.error(f"Failed to get history: {e}")
+            return []
+
     async def get_session_history(self, session_id: str) -> List[Dict]:
         """Get session message history from database"""
         try:
-            messages = await self.db.get_session_messages(session_id)
+            messages = await self.db.get_session_messages(
+                session_id, fields=['role', 'content', 'timestamp']
+            )
             return [
                 {
                     'role': msg['role'],
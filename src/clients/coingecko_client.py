@@ -1,9 +1,11 @@
 import logging
 import requests
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 import aiohttp
 import asyncio
+import time
 from functools import lru_cache, wraps
+from src.clients.http_session import get_shared_session
 
 logger = logging.getLogger(__name__)
 
@@ -28,37 +30,48 @@ def sync_lru_cache(maxsize=128, typed=False):
     return decorator
 
 class CoinGeckoClient:
+    # Price quotes are reused for a few seconds; intents often check the same token back to back
+    PRICE_TTL_SECONDS = 5
+    PRICE_CACHE_SIZE = 256
+
+    # token_id -> (expiry, price data); shared by every client so all sessions reuse one quote
+    _price_cache: Dict[str, Tuple[float, Dict]] = {}
+
+    # Common token mappings, shared by every client instance
+    SYMBOL_TO_COINGECKO = {
+        "BTC": "bitcoin",
+        "ETH": "ethereum",
+        "SOL": "solana",
+        "USDT": "tether",
+        "USDC": "usd-coin",
+        "BNB": "binancecoin",
+        "XRP": "ripple",
+        "ADA": "cardano",
+        "DOGE": "dogecoin",
+        "MATIC": "polygon",
+        "DOT": "polkadot",
+        "LINK": "chainlink",
+        "AVAX": "avalanche-2",
+        "UNI": "uniswap",
+        "AAVE": "aave",
+        "NEAR": "near",
+    }
+
     def __init__(self, api_key: str):
         """Initialize CoinGecko client with API key"""
         self.api_key = api_key
         self.base_url = "https://api.coingecko.com/api/v3"
-        self.session = None  # Will be initialized when needed
+        self.session = None  # Private session for context-manager use; the shared one otherwise
         self.headers = {
             "accept": "application/json",
             "x-cg-demo-api-key": api_key
         }
-        
-        # Common token mappings
-        self.SYMBOL_TO_COINGECKO = {
-            "BTC": "bitcoin",
-            "ETH": "ethereum",
-            "SOL": "solana",
-            "USDT": "tether",
-            "USDC": "usd-coin",
-            "BNB": "binancecoin",
-            "XRP": "ripple",
-            "ADA": "cardano",
-            "DOGE": "dogecoin",
-            "MATIC": "polygon",
-            "DOT": "polkadot",
-            "LINK": "chainlink",
-            "AVAX": "avalanche-2",
-            "UNI": "uniswap",
-            "AAVE": "aave",
-        }
 
-        # Cache for token IDs
+        # Cache for token IDs, keyed by upper-cased symbol
         self._id_cache = {}
+        
+        # token_id -> in-flight price request, so concurrent misses share one HTTP call
+        self._price_requests: Dict[str, asyncio.Task] = {}
 
     async def __aenter__(self):
         self.session = aiohttp.ClientSession()
@@ -72,9 +85,21 @@ class CoinGeckoClient:
         """Get token price using free API endpoint
         Docs: https://docs.coingecko.com/reference/simple-price-1
         """
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-            
+        cached = self._price_cache.get(token_id)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        
+        request = self._price_requests.get(token_id)
+        if request is None:
+            request = asyncio.create_task(self._fetch_token_price(token_id))
+            self._price_requests[token_id] = request
+            request.add_done_callback(lambda _: self._price_requests.pop(token_id, None))
+        # Shield so one caller being cancelled does not cancel the request for the others
+        return await asyncio.shield(request)
+
+    async def _fetch_token_price(self, token_id: str) -> Optional[Dict]:
+        """Fetch a token price from CoinGecko and store it in the shared price cache"""
+        session = self.session or get_shared_session()
         try:
             # Using the simple price endpoint which has higher rate limits
             url = f"{self.base_url}/simple/price"
@@ -85,7 +110,7 @@ class CoinGeckoClient:
                 "x_cg_demo_api_key": self.api_key
             }
             
-            async with self.session.get(url, params=params) as response:
+            async with session.get(url, params=params) as response:
                 if response.status == 429:
                     logger.warning("Rate limit hit, waiting before retry...")
                     await asyncio.sleep(60)  # Wait 60s on rate limit
@@ -99,15 +124,21 @@ class CoinGeckoClient:
                     return None
                 
                 token_data = data[token_id]
-                return {
+                price = {
                     "symbol": token_id,
                     "price_usd": token_data.get("usd"),
                     "price_change_24h": token_data.get("usd_24h_change")
                 }
+                self._price_cache.pop(token_id, None)
+                self._price_cache[token_id] = (time.monotonic() + self.PRICE_TTL_SECONDS, price)
+                if len(self._price_cache) > self.PRICE_CACHE_SIZE:
+                    # Dicts keep insertion order, so the first key is the oldest entry
+                    del self._price_cache[next(iter(self._price_cache))]
+                return price
                 
         except aiohttp.ClientError as e:
             logger.error(f"CoinGecko API connection error: {e}")
-            # Ensure session is closed on connection error
+            # Ensure a private session is closed on connection error
             if self.session:
                 await self.session.close()
                 self.session = None
@@ -127,21 +158,21 @@ class CoinGeckoClient:
                 "x_cg_demo_api_key": self.api_key
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 429:
-                        logger.warning("Rate limit hit, waiting before retry...")
-                        await asyncio.sleep(60)
-                        return None
-                        
-                    response.raise_for_status()
-                    data = await response.json()
-                    
-                    if not data or "coins" not in data or not data["coins"]:
-                        logger.debug(f"No results found for {query}")
-                        return None
+            session = self.session or get_shared_session()
+            async with session.get(url, params=params) as response:
+                if response.status == 429:
+                    logger.warning("Rate limit hit, waiting before retry...")
+                    await asyncio.sleep(60)
+                    return None
                     
-                    return data  # Return full response for processing
+                response.raise_for_status()
+                data = await response.json()
+                
+                if not data or "coins" not in data or not data["coins"]:
+                    logger.debug(f"No results found for {query}")
+                    return None
+                
+                return data  # Return full response for processing
                     
         except Exception as e:
             logger.error(f"CoinGecko search error for {query}: {e}")
@@ -152,23 +183,24 @@ class CoinGeckoClient:
         """Get CoinGecko ID for a token symbol"""
         try:
             # Check cache first
-            if symbol in self._id_cache:
-                return self._id_cache[symbol]
+            key = symbol.upper()
+            if key in self._id_cache:
+                return self._id_cache[key]
                 
             # First check our known mappings
-            if symbol in self.SYMBOL_TO_COINGECKO:
-                self._id_cache[symbol] = self.SYMBOL_TO_COINGECKO[symbol]
-                return self._id_cache[symbol]
+            if key in self.SYMBOL_TO_COINGECKO:
+                self._id_cache[key] = self.SYMBOL_TO_COINGECKO[key]
+                return self._id_cache[key]
                 
             # Try to search for the token
             search_data = await self.search_token(symbol)
             if search_data and isinstance(search_data, dict) and "coins" in search_data:
                 # Get the first matching result with exact symbol match
                 for coin in search_data["coins"]:
-                    if coin.get("symbol", "").upper() == symbol.upper():
+                    if coin.get("symbol", "").upper() == key:
                         logger.info(f"Found CoinGecko ID for {symbol}: {coin['id']}")
-                        self._id_cache[symbol] = coin['id']
-                        return self._id_cache[symbol]
+                        self._id_cache[key] = coin['id']
+                        return self._id_cache[key]
             
             logger.debug(f"No matching token found for symbol: {symbol}")
             return None
@@ -180,44 +212,44 @@ class CoinGeckoClient:
     async def get_token_details(self, coingecko_id: str) -> Optional[Dict]:
         """Get detailed token data from CoinGecko"""
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.base_url}/coins/{coingecko_id}"
-                params = {
-                    "x_cg_demo_api_key": self.api_key,
-                    "localization": "false",
-                    "tickers": "false",
-                    "community_data": "true",
-                    "developer_data": "true",
-                    "sparkline": "false"
-                }
-                
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return {
-                            "market_cap": data.get("market_data", {}).get("market_cap", {}).get("usd"),
-                            "total_volume": data.get("market_data", {}).get("total_volume", {}).get("usd"),
-                            "circulating_supply": data.get("market_data", {}).get("circulating_supply"),
-                            "total_supply": data.get("market_data", {}).get("total_supply"),
-                            "max_supply": data.get("market_data", {}).get("max_supply"),
-                            "price_change_24h": data.get("market_data", {}).get("price_change_percentage_24h"),
-                            "price_change_7d": data.get("market_data", {}).get("price_change_percentage_7d"),
-                            "price_change_30d": data.get("market_data", {}).get("price_change_percentage_30d"),
-                            "twitter_followers": data.get("community_data", {}).get("twitter_followers"),
-                            "reddit_subscribers": data.get("community_data", {}).get("reddit_subscribers"),
-                            "telegram_channel_user_count": data.get("community_data", {}).get("telegram_channel_user_count"),
-                            "forks": data.get("developer_data", {}).get("forks"),
-                            "stars": data.get("developer_data", {}).get("stars"),
-                            "subscribers": data.get("developer_data", {}).get("subscribers"),
-                            "total_issues": data.get("developer_data", {}).get("total_issues"),
-                            "closed_issues": data.get("developer_data", {}).get("closed_issues"),
-                            "pull_requests_merged": data.get("developer_data", {}).get("pull_requests_merged"),
-                            "commit_count_4_weeks": data.get("developer_data", {}).get("commit_count_4_weeks"),
-                        }
-                    else:
-                        logger.error(f"Error getting token details for {coingecko_id}: {response.status}")
-                        return None
-                        
+            session = self.session or get_shared_session()
+            url = f"{self.base_url}/coins/{coingecko_id}"
+            params = {
+                "x_cg_demo_api_key": self.api_key,
+                "localization": "false",
+                "tickers": "false",
+                "community_data": "true",
+                "developer_data": "true",
+                "sparkline": "false"
+            }
+            
+            async with session.get(url, params=params) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return {
+                        "market_cap": data.get("market_data", {}).get("market_cap", {}).get("usd"),
+                        "total_volume": data.get("market_data", {}).get("total_volume", {}).get("usd"),
+                        "circulating_supply": data.get("market_data", {}).get("circulating_supply"),
+                        "total_supply": data.get("market_data", {}).get("total_supply"),
+                        "max_supply": data.get("market_data", {}).get("max_supply"),
+                        "price_change_24h": data.get("market_data", {}).get("price_change_percentage_24h"),
+                        "price_change_7d": data.get("market_data", {}).get("price_change_percentage_7d"),
+                        "price_change_30d": data.get("market_data", {}).get("price_change_percentage_30d"),
+                        "twitter_followers": data.get("community_data", {}).get("twitter_followers"),
+                        "reddit_subscribers": data.get("community_data", {}).get("reddit_subscribers"),
+                        "telegram_channel_user_count": data.get("community_data", {}).get("telegram_channel_user_count"),
+                        "forks": data.get("developer_data", {}).get("forks"),
+                        "stars": data.get("developer_data", {}).get("stars"),
+                        "subscribers": data.get("developer_data", {}).get("subscribers"),
+                        "total_issues": data.get("developer_data", {}).get("total_issues"),
+                        "closed_issues": data.get("developer_data", {}).get("closed_issues"),
+                        "pull_requests_merged": data.get("developer_data", {}).get("pull_requests_merged"),
+                        "commit_count_4_weeks": data.get("developer_data", {}).get("commit_count_4_weeks"),
+                    }
+                else:
+                    logger.error(f"Error getting token details for {coingecko_id}: {response.status}")
+                    return None
+                    
         except Exception as e:
             logger.error(f"Error getting token details for {coingecko_id}: {e}")
             return None
\ No newline at end of file
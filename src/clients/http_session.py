@@ -0,0 +1,33 @@
+import asyncio
+import logging
+from typing import Dict
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# One pooled session per event loop, shared by the HTTP API clients so
+# connections (and their TLS handshakes) are reused across tools and sessions
+_sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+def get_shared_session() -> aiohttp.ClientSession:
+    """Get the shared aiohttp session for the running event loop"""
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            )
+        )
+        _sessions[loop] = session
+    return session
+
+async def close_shared_session() -> None:
+    """Close the running event loop's shared session, if one was opened"""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session and not session.closed:
+        await session.close()
+        logger.info("Closed shared HTTP session")
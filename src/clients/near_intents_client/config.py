@@ -1,4 +1,5 @@
 # config.py - Token configuration for Defuse Protocol
+from functools import lru_cache
 
 # Token data for a minimal set of tokens (NEAR and USDC)
 TOKENS = [
@@ -443,6 +444,8 @@ TOKENS = [
 ]
 
 # Helper functions
+# TOKENS is static, so symbol/chain lookups are memoized; callers get the shared token dicts
+@lru_cache(maxsize=128)
 def get_token_by_symbol(symbol, chain=None):
     """Find a token by its symbol, optionally filtered by chain."""
     for token in TOKENS:
@@ -451,6 +454,7 @@ def get_token_by_symbol(symbol, chain=None):
                 return token
     return None
 
+@lru_cache(maxsize=128)
 def get_token_id(symbol, chain="near"):
     """Get the token_id for a specific token on a specific chain."""
     token = get_token_by_symbol(symbol, chain)
@@ -458,6 +462,7 @@ def get_token_id(symbol, chain="near"):
         return token["chains"][chain].get("token_id")
     return None
 
+@lru_cache(maxsize=128)
 def get_defuse_asset_id(symbol, chain="near"):
     """Get the defuse_asset_id for a specific token on a specific chain."""
     token = get_token_by_symbol(symbol, chain)
@@ -465,6 +470,7 @@ def get_defuse_asset_id(symbol, chain="near"):
         return token["chains"][chain].get("defuse_asset_id")
     return None
 
+@lru_cache(maxsize=128)
 def to_asset_id(symbol, chain="near"):
     """Convert a token symbol to an asset ID for use in intents."""
     defuse_asset_id = get_defuse_asset_id(symbol, chain)
@@ -484,14 +490,17 @@ def to_decimals(amount, symbol, chain="near"):
     """Convert a human-readable amount to base units."""
     token = get_token_by_symbol(symbol)
     if token:
-        return str(int(Decimal(str(amount)) * Decimal(10) ** token["decimals"]))
+        # scaleb shifts the exponent by the token's decimals; no 10**decimals Decimal is built per call
+        return str(int(Decimal(str(amount)).scaleb(token["decimals"])))
     return None
 
 def from_decimals(amount_str, symbol):
     """Convert from base units to human-readable amount."""
     token = get_token_by_symbol(symbol)
     if token:
-        return float(amount_str) / (10 ** token["decimals"])
+        # Scale exactly in Decimal and round to float once; float(amount_str) alone
+        # already drops digits of 24-decimal NEAR amounts
+        return float(Decimal(str(amount_str)).scaleb(-token["decimals"]))
     return None
 
 def get_supported_tokens(chain=None):
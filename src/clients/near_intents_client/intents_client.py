@@ -1,4 +1,5 @@
 from typing import TypedDict, List, Dict, Union
+from decimal import Decimal
 import borsh_construct
 import os
 import json
@@ -204,7 +205,7 @@ def intent_deposit(account, token, amount):
     if not amount_base:
         raise ValueError(f"Invalid amount for {token}")
         
-    account.function_call(token_id, 'ft_transfer_call', {
+    return account.function_call(token_id, 'ft_transfer_call', {
         "receiver_id": "intents.near",
         "amount": amount_base,
         "msg": ""
@@ -389,7 +390,7 @@ def get_intent_balance(account, token, chain="near"):
         if balance_response and 'result' in balance_response:
             token_info = get_token_by_symbol(token)
             decimals = token_info['decimals'] if token_info else 6
-            return float(balance_response['result']) / (10 ** decimals)
+            return float(Decimal(str(balance_response['result'])).scaleb(-decimals))
     except Exception as e:
         logger.error(f"Error getting balance: {str(e)}")
     return 0.0
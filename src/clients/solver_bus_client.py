@@ -6,18 +6,23 @@ import uuid
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime, timedelta
 import websockets
+from src.clients.http_session import get_shared_session
 
 logger = logging.getLogger(__name__)
 
 class SolverBusClient:
     """Client for interacting with the Defuse Protocol Solver Bus API"""
     
+    # Bound each JSON-RPC call; the shared session's default would let a stuck relay hold a caller for minutes
+    RPC_TIMEOUT = aiohttp.ClientTimeout(total=5)
+    
     def __init__(self, rpc_url: str = "https://solver-relay-v2.chaindefuser.com/rpc", 
                  ws_url: str = "wss://solver-relay-v2.chaindefuser.com/ws"):
         """Initialize the Solver Bus client"""
         self.rpc_url = rpc_url
         self.ws_url = ws_url
         self.session = None
+        self._owns_session = False  # Only context-manager sessions are closed by this client
         self.ws_connection = None
         self.subscription_id = None
         self.request_id = 1  # Counter for JSON-RPC request IDs
@@ -27,23 +32,25 @@ class SolverBusClient:
     async def __aenter__(self):
         """Set up aiohttp session for async context manager support"""
         self.session = aiohttp.ClientSession()
+        self._owns_session = True
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Clean up resources when exiting context"""
-        if self.session:
+        if self.session and self._owns_session:
             await self.session.close()
         if self.ws_connection:
             await self.ws_connection.close()
     
     async def initialize(self):
-        """Initialize the client and create HTTP session"""
-        if not self.session:
-            self.session = aiohttp.ClientSession()
+        """Initialize the client with the shared HTTP session"""
+        if not self.session or self.session.closed:
+            self.session = get_shared_session()
+            self._owns_session = False
             
     async def cleanup(self):
         """Clean up resources"""
-        if self.session:
+        if self.session and self._owns_session:
             await self.session.close()
         if self.ws_connection:
             await self.ws_connection.close()
@@ -104,7 +111,7 @@ class SolverBusClient:
         self.request_id += 1
         
         try:
-            async with self.session.post(self.rpc_url, json=request_data) as response:
+            async with self.session.post(self.rpc_url, json=request_data, timeout=self.RPC_TIMEOUT) as response:
                 if response.status != 200:
                     error_text = await response.text()
                     logger.error(f"Error getting quote: {response.status} - {error_text}")
@@ -170,7 +177,7 @@ class SolverBusClient:
         self.request_id += 1
         
         try:
-            async with self.session.post(self.rpc_url, json=request_data) as response:
+            async with self.session.post(self.rpc_url, json=request_data, timeout=self.RPC_TIMEOUT) as response:
                 if response.status != 200:
                     error_text = await response.text()
                     logger.error(f"Error publishing intent: {response.status} - {error_text}")
@@ -235,7 +242,7 @@ class SolverBusClient:
         self.request_id += 1
         
         try:
-            async with self.session.post(self.rpc_url, json=request_data) as response:
+            async with self.session.post(self.rpc_url, json=request_data, timeout=self.RPC_TIMEOUT) as response:
                 if response.status != 200:
                     error_text = await response.text()
                     logger.error(f"Error getting intent status: {response.status} - {error_text}")
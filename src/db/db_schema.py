@@ -1,9 +1,15 @@
-from typing import TypedDict, List, Optional, Dict, Literal, Any, Union
+from typing import TypedDict, List, Optional, Dict, Literal, Any, Union, Tuple
 from datetime import datetime, UTC
+import asyncio
 import logging
 import uuid
 from bson.objectid import ObjectId
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import IndexModel, ASCENDING, UpdateOne
+from pymongo.write_concern import WriteConcern
+from pymongo.errors import OperationFailure
 from src.db.enums import (
     OperationStatus,
     ToolOperationState,
@@ -17,6 +23,21 @@ from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
+# Enum values used on every write path
+_STATUS_PENDING = OperationStatus.PENDING.value
+_STATUS_APPROVED = OperationStatus.APPROVED.value
+_STATUS_SCHEDULED = OperationStatus.SCHEDULED.value
+_SCHEDULE_PENDING = ScheduleState.PENDING.value
+
+_REQUIRED_COLLECTIONS = frozenset({
+    'rin.messages',
+    'rin.context_configs',
+    'rin.tool_items',
+    'rin.tool_operations',
+    'rin.tool_executions',
+    'rin.scheduled_operations'
+})
+
 class Message(TypedDict):
     role: str  # "host" or username from livestream
     content: str
@@ -34,7 +55,7 @@ class Session(TypedDict):
 class ContextConfiguration(TypedDict):
     session_id: str
     latest_summary: Optional[dict]  # The most recent summary message
-    active_message_ids: List[str]   # IDs of messages in current context
+    active_message_ids: List[ObjectId]   # IDs of messages in current context (older configs hold str)
     last_updated: datetime
 
 class WorkflowOperation(TypedDict):
@@ -287,7 +308,38 @@ class LimitOrderParams(ToolItemParams):
         }
     }
 
+# Shared RinDB instances keyed by mongo_uri; see RinDB.get. Motor binds a client
+# to the event loop lazily on first use, so one client serves sync and async callers
+_client_pool: Dict[str, "RinDB"] = {}
+
 class RinDB:
+    # Fixed metadata fields stamped on every tool item
+    _TOOL_ITEM_META_TEMPLATE = {"generated_by": "system", "version": "1.0"}
+
+    @classmethod
+    def get(cls, mongo_uri: str) -> "RinDB":
+        """Get the process-wide RinDB for a URI, sharing one client and connection pool.
+
+        Services should use this rather than constructing AsyncIOMotorClient directly.
+        """
+        db = _client_pool.get(mongo_uri)
+        if db is None:
+            client = AsyncIOMotorClient(
+                mongo_uri,
+                maxPoolSize=50,
+                minPoolSize=5,
+                maxIdleTimeMS=60000
+            )
+            db = _client_pool[mongo_uri] = cls(client)
+        return db
+
+    @classmethod
+    def close_shared(cls, mongo_uri: str) -> None:
+        """Close and forget the shared client for a URI"""
+        db = _client_pool.pop(mongo_uri, None)
+        if db is not None:
+            db.client.close()
+
     def __init__(self, client: AsyncIOMotorClient):
         self.client = client
         self.db = client['rin_multimodal']
@@ -297,46 +349,37 @@ class RinDB:
         
         # Current collections
         self.messages = self.db['rin.messages']
+        # Chat history appends only need the primary's ack, not journal/replication
+        self._messages_fast = self.messages.with_options(
+            write_concern=WriteConcern(w=1, j=False)
+        )
         self.context_configs = self.db['rin.context_configs']
         self.tool_items = self.db['rin.tool_items']
         self.tool_operations = self.db['rin.tool_operations']
         self.tool_executions = self.db['rin.tool_executions']
         self.scheduled_operations = self.db['rin.scheduled_operations']
-        self._initialized = False
+        # Undecoded view for scans that only need a field or two
+        self._raw_scheduled_operations = self.scheduled_operations.with_options(
+            codec_options=CodecOptions(document_class=RawBSONDocument)
+        )
+        self._ready = asyncio.Event()  # Set once collections and indexes are verified
         logger.info(f"Connected to database: {self.db.name}")
 
     async def initialize(self):
         """Initialize database and collections"""
+        if self._ready.is_set():
+            return True
         try:
-            collections = await self.db.list_collection_names()
+            collections = set(await self.db.list_collection_names())
             
             # Create collections if they don't exist
-            required_collections = [
-                'rin.messages',
-                'rin.context_configs',
-                'rin.tool_items',
-                'rin.tool_operations',
-                'rin.tool_executions',
-                'rin.scheduled_operations'
-            ]
-            
-            for collection in required_collections:
-                if collection not in collections:
-                    await self.db.create_collection(collection)
-                    logger.info(f"Created {collection} collection")
+            for collection in _REQUIRED_COLLECTIONS - collections:
+                await self.db.create_collection(collection)
+                logger.info(f"Created {collection} collection")
             
             # Setup indexes
             await self._setup_indexes()
-            self._initialized = True
-            
-            # Add index for scheduled operations
-            await self.scheduled_operations.create_index([
-                ("schedule_state", 1),
-                ("content_type", 1)
-            ])
-            await self.scheduled_operations.create_index([
-                ("tool_operation_id", 1)
-            ], unique=True)
+            self._ready.set()
             
             return True
             
@@ -346,87 +389,125 @@ class RinDB:
 
     async def is_initialized(self) -> bool:
         """Check if database is properly initialized"""
+        if self._ready.is_set():
+            return True
         try:
             collections = await self.db.list_collection_names()
-            required_collections = [
-                'rin.messages',
-                'rin.context_configs',
-                'rin.tool_items',
-                'rin.tool_operations',
-                'rin.tool_executions',
-                'rin.scheduled_operations'
-            ]
-            
-            has_collections = all(col in collections for col in required_collections)
+            has_collections = _REQUIRED_COLLECTIONS.issubset(collections)
             
             if not has_collections:
                 logger.warning("Required collections not found")
                 return False
                 
             await self.db.command('ping')
+            self._ready.set()
             return True
         except Exception as e:
             logger.error(f"Database connection check failed: {e}")
             return False
 
+    async def ping(self) -> bool:
+        """Check that the server is reachable (always hits the network)"""
+        try:
+            await self.db.command('ping')
+            return True
+        except Exception as e:
+            logger.error(f"Database ping failed: {e}")
+            return False
+
     async def _setup_indexes(self):
         """Setup indexes for Rin collections"""
         try:
-            # Message and context indexes
-            await self.messages.create_index([("session_id", 1)])
-            await self.messages.create_index([("timestamp", 1)])
-            await self.context_configs.create_index([("session_id", 1)])
-
-            # Tool operations indexes
-            await self.tool_operations.create_index([("session_id", 1)])
-            await self.tool_operations.create_index([("state", 1)])
-            await self.tool_operations.create_index([("tool_type", 1)])
-            await self.tool_operations.create_index([("last_updated", 1)])
-            
-            # Tool executions tracking
-            await self.tool_executions.create_index([("tool_operation_id", 1)])
-            await self.tool_executions.create_index([("session_id", 1)])
-            await self.tool_executions.create_index([("state", 1)])
-            await self.tool_executions.create_index([("created_at", 1)])
-            
-            # Tool items (content)
-            await self.tool_items.create_index([("session_id", 1)])
-            await self.tool_items.create_index([("content_type", 1)])
-            await self.tool_items.create_index([("status", 1)])
-            await self.tool_items.create_index([("state", 1)])
-            await self.tool_items.create_index([("schedule_id", 1)])
-            await self.tool_items.create_index([("tool_operation_id", 1)])
-
-            # Temporal indexes
-            await self.tool_items.create_index([("created_at", 1)])
-            await self.tool_items.create_index([("scheduled_time", 1)])
-            await self.tool_items.create_index([("posted_time", 1)])
-
-            # Compound indexes for common queries
-            await self.tool_items.create_index([
-                ("tool_operation_id", 1),
-                ("state", 1)
-            ])
-            await self.tool_items.create_index([
-                ("tool_operation_id", 1),
-                ("status", 1)
-            ])
-            
-            # Scheduled operations indexes
-            await self.scheduled_operations.create_index([("session_id", 1)])
-            await self.scheduled_operations.create_index([("status", 1)])
-            await self.scheduled_operations.create_index([("scheduled_time", 1)])
-            await self.scheduled_operations.create_index([("content_type", 1)])
-            await self.scheduled_operations.create_index([
-                ("status", 1),
-                ("scheduled_time", 1)
-            ])
+            # One batched createIndexes command per collection, all collections in parallel
+            await asyncio.gather(
+                # Message and context indexes
+                self.messages.create_indexes([
+                    IndexModel([("session_id", ASCENDING)]),
+                    IndexModel([("timestamp", ASCENDING)]),
+                    IndexModel([("session_id", ASCENDING), ("_id", ASCENDING)])
+                ]),
+                self.context_configs.create_indexes([
+                    IndexModel([("session_id", ASCENDING)])
+                ]),
+
+                # Tool operations indexes
+                self.tool_operations.create_indexes([
+                    IndexModel([("session_id", ASCENDING)]),
+                    IndexModel([("state", ASCENDING)]),
+                    IndexModel([("session_id", ASCENDING), ("state", ASCENDING)]),
+                    IndexModel([("tool_type", ASCENDING)]),
+                    IndexModel([("last_updated", ASCENDING)])
+                ]),
+
+                # Tool executions tracking
+                self.tool_executions.create_indexes([
+                    IndexModel([("tool_operation_id", ASCENDING)]),
+                    IndexModel([("session_id", ASCENDING)]),
+                    IndexModel([("state", ASCENDING)]),
+                    IndexModel([("created_at", ASCENDING)])
+                ]),
+
+                # Tool items (content)
+                self.tool_items.create_indexes([
+                    IndexModel([("session_id", ASCENDING)]),
+                    IndexModel([("content_type", ASCENDING)]),
+                    IndexModel([("state", ASCENDING)]),
+                    IndexModel([("schedule_id", ASCENDING)]),
+                    IndexModel([("tool_operation_id", ASCENDING)]),
+
+                    # Temporal indexes
+                    IndexModel([("created_at", ASCENDING)]),
+                    IndexModel([("scheduled_time", ASCENDING)]),
+                    IndexModel([("posted_time", ASCENDING)]),
+
+                    # Compound indexes for common queries
+                    IndexModel([("tool_operation_id", ASCENDING), ("state", ASCENDING)]),
+                    IndexModel([("tool_operation_id", ASCENDING), ("status", ASCENDING)]),
+                    # get_pending_items; the status prefix also serves status-only queries
+                    IndexModel(
+                        [("status", ASCENDING), ("content_type", ASCENDING), ("schedule_id", ASCENDING)],
+                        name="pending_items_lookup"
+                    )
+                ]),
+
+                # Scheduled operations indexes
+                self.scheduled_operations.create_indexes([
+                    IndexModel([("session_id", ASCENDING)]),
+                    IndexModel([("scheduled_time", ASCENDING)]),
+                    IndexModel([("content_type", ASCENDING)]),
+                    IndexModel([("schedule_state", ASCENDING), ("content_type", ASCENDING)]),
+                    IndexModel([("tool_operation_id", ASCENDING)], unique=True)
+                ]),
+                self._setup_upcoming_schedules_index()
+            )
 
             logger.info("Successfully created database indexes")
         except Exception as e:
             logger.error(f"Error setting up indexes: {str(e)}")
             raise
 
+    async def _setup_upcoming_schedules_index(self):
+        """Index (status, scheduled_time) for non-terminal schedules only.
+
+        A $in partialFilterExpression needs MongoDB 6.0+; older servers get the
+        full index instead. The full status indexes the partial one replaces are
+        dropped by migrations/drop_superseded_schedule_indexes.py.
+        """
+        keys = [("status", ASCENDING), ("scheduled_time", ASCENDING)]
+        try:
+            await self.scheduled_operations.create_index(
+                keys,
+                name="upcoming_schedules",
+                partialFilterExpression={"status": {"$in": [
+                    _STATUS_PENDING,
+                    _STATUS_APPROVED,
+                    _STATUS_SCHEDULED
+                ]}}
+            )
+        except OperationFailure as e:
+            logger.error(f"Could not create partial upcoming_schedules index, keeping the full one: {e}")
+            await self.scheduled_operations.create_index(keys)
+
     async def add_message(self, session_id: str, role: str, content: str, 
                          interaction_type: str = 'local_agent', metadata: Optional[dict] = None):
         """Add a message to the database
@@ -448,11 +529,41 @@ class RinDB:
         if metadata:
             message["metadata"] = metadata
             
-        await self.messages.insert_one(message)
+        await self._messages_fast.insert_one(message)
         return message
 
-    async def get_session_messages(self, session_id: str):
-        cursor = self.messages.find({"session_id": session_id}).sort("timestamp", 1)
+    async def add_messages(self, session_id: str, messages: List[Dict[str, str]],
+                           interaction_type: str = 'local_agent', metadata: Optional[dict] = None):
+        """Add several messages to the database in a single write
+        
+        Args:
+            session_id: Unique session identifier
+            messages: Ordered list of {"role": ..., "content": ...} dicts
+            interaction_type: Either "local_agent" or "livestream"
+            metadata: Optional additional metadata applied to every message
+        """
+        documents = []
+        for msg in messages:
+            document = {
+                "session_id": session_id,
+                "role": msg["role"],
+                "content": msg["content"],
+                "timestamp": datetime.utcnow(),
+                "interaction_type": interaction_type
+            }
+            if metadata:
+                document["metadata"] = metadata
+            documents.append(document)
+            
+        if documents:
+            await self._messages_fast.insert_many(documents, ordered=True)
+        return documents
+
+    async def get_session_messages(self, session_id: str, *, fields: Optional[List[str]] = None):
+        projection = {field: 1 for field in fields} if fields else None
+        cursor = self.messages.find(
+            {"session_id": session_id}, projection=projection
+        ).sort("timestamp", 1).batch_size(500)
         return await cursor.to_list(length=None)
 
     async def clear_session(self, session_id: str):
@@ -473,7 +584,7 @@ class RinDB:
             logger.error(f"Failed to update session metadata: {e}")
             return False
 
-    async def add_context_summary(self, session_id: str, summary: dict, active_message_ids: List[str]):
+    async def add_context_summary(self, session_id: str, summary: dict, active_message_ids: List[ObjectId]):
         """Update context configuration with new summary"""
         await self.context_configs.update_one(
             {"session_id": session_id},
@@ -491,12 +602,17 @@ class RinDB:
         """Get current context configuration"""
         return await self.context_configs.find_one({"session_id": session_id})
 
-    async def get_messages_by_ids(self, session_id: str, message_ids: List[str]) -> List[Message]:
+    async def get_messages_by_ids(self, session_id: str, message_ids: List[Union[ObjectId, str]]) -> List[Message]:
         """Get specific messages by their IDs"""
-        cursor = self.messages.find({
-            "session_id": session_id,
-            "_id": {"$in": [ObjectId(id) for id in message_ids]}
-        }).sort("timestamp", 1)
+        # IDs are stored as ObjectIds; only configs written before that need converting
+        if not all(isinstance(id, ObjectId) for id in message_ids):
+            message_ids = [id if isinstance(id, ObjectId) else ObjectId(id) for id in message_ids]
+        # Sorted IDs let the (session_id, _id) index be walked in a single pass
+        message_ids = sorted(message_ids)
+        cursor = self.messages.find(
+            {"session_id": session_id, "_id": {"$in": message_ids}},
+            projection={"_id": 1, "content": 1, "role": 1, "timestamp": 1}
+        ).sort("timestamp", 1)
         return await cursor.to_list(length=None)
 
     async def create_tool_item(
@@ -513,10 +629,12 @@ class RinDB:
             if not content.get('raw_content'):
                 raise ValueError("Tool item content cannot be empty")
 
+            now = datetime.now(UTC)
+            now_iso = now.isoformat()
             tool_item = {
                 "session_id": session_id,
                 "content_type": content_type,
-                "status": OperationStatus.PENDING.value,
+                "status": _STATUS_PENDING,
                 "content": {
                     **content,
                     "version": "1.0"
@@ -525,14 +643,8 @@ class RinDB:
                     **parameters,
                     "retry_policy": parameters.get("retry_policy", {"max_attempts": 3, "delay": 300})
                 },
-                "metadata": {
-                    **(metadata or {}),
-                    "generated_at": datetime.now(UTC).isoformat(),
-                    "generated_by": "system",
-                    "last_modified": datetime.now(UTC).isoformat(),
-                    "version": "1.0"
-                },
-                "created_at": datetime.now(UTC),
+                "metadata": self._tool_item_metadata(metadata, now_iso),
+                "created_at": now,
                 "retry_count": 0
             }
 
@@ -543,18 +655,29 @@ class RinDB:
             logger.error(f"Error creating tool item: {e}")
             raise
 
+    @classmethod
+    def _tool_item_metadata(cls, metadata: Optional[Dict], now_iso: str) -> Dict:
+        """Caller metadata overlaid with the system-managed tool item fields"""
+        meta = dict(metadata) if metadata else {}
+        meta.update(cls._TOOL_ITEM_META_TEMPLATE)
+        meta["generated_at"] = meta["last_modified"] = now_iso
+        return meta
+
     async def get_pending_items(self, 
                               content_type: Optional[str] = None,
-                              schedule_id: Optional[str] = None) -> List[Dict]:
+                              schedule_id: Optional[str] = None,
+                              *,
+                              fields: Optional[List[str]] = None) -> List[Dict]:
         """Get pending items, optionally filtered by type and schedule"""
         try:
-            query = {"status": OperationStatus.PENDING.value}
+            query = {"status": _STATUS_PENDING}
             if content_type:
                 query["content_type"] = content_type
             if schedule_id:
                 query["schedule_id"] = schedule_id
             
-            cursor = self.tool_items.find(query)
+            projection = {field: 1 for field in fields} if fields else None
+            cursor = self.tool_items.find(query, projection=projection).batch_size(500)
             return await cursor.to_list(length=None)
         except Exception as e:
             logger.error(f"Error fetching pending items: {e}")
@@ -568,48 +691,86 @@ class RinDB:
                                     metadata: Optional[Dict] = None) -> bool:
         """Update tool item status and related fields"""
         try:
-            update_data = {
-                "status": status.value if isinstance(status, OperationStatus) else status,
-                "last_updated": datetime.now(UTC)
-            }
-            
-            if status == OperationStatus.EXECUTED and api_response:
-                update_data["executed_time"] = datetime.now(UTC)
-                update_data["api_response"] = api_response
-            
-            if error:
-                update_data["last_error"] = error
-            
-            if metadata:
-                update_data["metadata"] = {
-                    **update_data.get("metadata", {}),
-                    **metadata
-                }
-            
             result = await self.tool_items.update_one(
                 {"_id": ObjectId(item_id)},
-                {
-                    "$set": update_data,
-                    "$inc": {"retry_count": 1} if error else {}
-                }
+                self._tool_item_status_update(status, api_response, error, metadata)
             )
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error updating tool item status: {e}")
             return False
 
+    async def bulk_update_tool_item_status(
+        self,
+        updates: List[Tuple[str, OperationStatus, Optional[Dict], Optional[str], Optional[Dict]]]
+    ) -> int:
+        """Update the status of many tool items in one round-trip.
+
+        Each entry is (item_id, status, api_response, error, metadata), mirroring
+        update_tool_item_status. Returns the number of modified items.
+        """
+        if not updates:
+            return 0
+        try:
+            ops = [
+                UpdateOne(
+                    {"_id": ObjectId(item_id)},
+                    self._tool_item_status_update(status, api_response, error, metadata)
+                )
+                for item_id, status, api_response, error, metadata in updates
+            ]
+            result = await self.tool_items.bulk_write(ops, ordered=False)
+            return result.modified_count
+        except Exception as e:
+            logger.error(f"Error bulk updating tool item status: {e}")
+            return 0
+
+    @staticmethod
+    def _tool_item_status_update(status: OperationStatus,
+                                 api_response: Optional[Dict] = None,
+                                 error: Optional[str] = None,
+                                 metadata: Optional[Dict] = None) -> Dict:
+        """Build the update document for a tool item status change"""
+        now = datetime.now(UTC)
+        update_data = {
+            "status": status.value if isinstance(status, OperationStatus) else status,
+            "last_updated": now
+        }
+        
+        if status == OperationStatus.EXECUTED and api_response:
+            update_data["executed_time"] = now
+            update_data["api_response"] = api_response
+        
+        if error:
+            update_data["last_error"] = error
+        
+        if metadata:
+            update_data["metadata"] = {
+                **update_data.get("metadata", {}),
+                **metadata
+            }
+
+        update = {"$set": update_data}
+        if error:
+            update["$inc"] = {"retry_count": 1}
+        return update
+
     async def set_tool_operation_state(self, session_id: str, operation_data: Dict) -> Optional[Dict]:
         """Set tool operation state"""
         try:
             # Ensure required fields
+            now = datetime.now(UTC)
             operation_data.update({
-                "last_updated": datetime.now(UTC)
+                "last_updated": now
             })
             
             # Handle both new operations and updates
+            update = {"$set": operation_data}
+            if "created_at" not in operation_data:
+                update["$setOnInsert"] = {"created_at": now}
             result = await self.tool_operations.find_one_and_update(
                 {"session_id": session_id},
-                {"$set": operation_data},
+                update,
                 upsert=True,
                 return_document=True
             )
@@ -625,10 +786,12 @@ class RinDB:
             logger.error(f"Error setting operation state: {e}")
             return None
 
-    async def get_tool_operation_state(self, session_id: str) -> Optional[Dict]:
+    async def get_tool_operation_state(self, session_id: str, *,
+                                       fields: Optional[List[str]] = None) -> Optional[Dict]:
         """Get tool operation state"""
         try:
-            return await self.tool_operations.find_one({"session_id": session_id})
+            projection = {field: 1 for field in fields} if fields else None
+            return await self.tool_operations.find_one({"session_id": session_id}, projection=projection)
         except Exception as e:
             logger.error(f"Error getting operation state: {e}")
             return None
@@ -644,15 +807,6 @@ class RinDB:
             query = {}
             
             # Build query based on provided parameters
-            if tool_operation_id:
-                if ObjectId.is_valid(tool_operation_id):
-                    query["_id"] = ObjectId(tool_operation_id)
-                else:
-                    query["$or"] = [
-                        {"session_id": tool_operation_id},
-                        {"tool_operation_id": tool_operation_id}
-                    ]
-            
             if status:
                 query["status"] = status
                 
@@ -660,7 +814,18 @@ class RinDB:
                 query["state"] = state
                 
             # Execute query
-            schedule = await self.scheduled_operations.find_one(query)
+            if tool_operation_id and not ObjectId.is_valid(tool_operation_id):
+                # Two indexed point lookups instead of an $or; the operation ID is the common case
+                query["tool_operation_id"] = tool_operation_id
+                schedule = await self.scheduled_operations.find_one(query)
+                if not schedule:
+                    del query["tool_operation_id"]
+                    query["session_id"] = tool_operation_id
+                    schedule = await self.scheduled_operations.find_one(query)
+            else:
+                if tool_operation_id:
+                    query["_id"] = ObjectId(tool_operation_id)
+                schedule = await self.scheduled_operations.find_one(query)
             
             if schedule:
                 if tool_operation_id:
@@ -677,6 +842,30 @@ class RinDB:
             logger.error(f"Error getting scheduled operation: {e}")
             return None
 
+    def build_scheduled_operation(
+        self,
+        tool_operation_id: str,
+        content_type: str,
+        schedule_info: Dict,
+    ) -> ScheduledOperation:
+        """Build a new scheduled operation document without writing it"""
+        now = datetime.now(UTC)
+        return {
+            "schedule_id": str(ObjectId()),
+            "tool_operation_id": tool_operation_id,
+            "content_type": content_type,
+            "schedule_state": _SCHEDULE_PENDING,
+            "schedule_info": schedule_info,
+            "created_at": now,
+            "last_updated": now,
+            "state_history": [{
+                "state": _SCHEDULE_PENDING,
+                "timestamp": now.isoformat(),
+                "reason": "Schedule initialized"
+            }],
+            "metadata": {}
+        }
+
     async def create_scheduled_operation(
         self,
         tool_operation_id: str,
@@ -684,21 +873,7 @@ class RinDB:
         schedule_info: Dict,
     ) -> str:
         """Create new scheduled operation"""
-        operation = ScheduledOperation(
-            schedule_id=str(ObjectId()),
-            tool_operation_id=tool_operation_id,
-            content_type=content_type,
-            schedule_state=ScheduleState.PENDING.value,
-            schedule_info=schedule_info,
-            created_at=datetime.now(UTC),
-            last_updated=datetime.now(UTC),
-            state_history=[{
-                "state": ScheduleState.PENDING.value,
-                "timestamp": datetime.now(UTC).isoformat(),
-                "reason": "Schedule initialized"
-            }],
-            metadata={}
-        )
+        operation = self.build_scheduled_operation(tool_operation_id, content_type, schedule_info)
         result = await self.scheduled_operations.insert_one(operation)
         return str(result.inserted_id)
 
@@ -712,9 +887,10 @@ class RinDB:
         """Update schedule state with history tracking"""
         try:
             # Prepare update operations separately
+            now = datetime.now(UTC)
             set_data = {
                 "schedule_state": state.value,
-                "last_updated": datetime.now(UTC)
+                "last_updated": now
             }
             
             if metadata:
@@ -726,7 +902,7 @@ class RinDB:
                 "$push": {
                     "state_history": {
                         "state": state.value,
-                        "timestamp": datetime.now(UTC).isoformat(),
+                        "timestamp": now.isoformat(),
                         "reason": reason
                     }
                 }
@@ -753,14 +929,14 @@ class RinDB:
         """Delete all tweet schedules and their associated tweets"""
         try:
             # Get all schedule IDs first
-            schedule_cursor = self.scheduled_operations.find({})
+            schedule_cursor = self._raw_scheduled_operations.find({}, projection={"_id": 1})
             schedules = await schedule_cursor.to_list(length=None)
             schedule_ids = [str(schedule['_id']) for schedule in schedules]
             
-            # Delete all tweets associated with these schedules
-            for schedule_id in schedule_ids:
-                await self.tool_items.delete_many({"schedule_id": schedule_id})
-                logger.info(f"Deleted items for schedule {schedule_id}")
+            # Delete all tweets associated with these schedules in one pass
+            if schedule_ids:
+                items_result = await self.tool_items.delete_many({"schedule_id": {"$in": schedule_ids}})
+                logger.info(f"Deleted {items_result.deleted_count} items for {len(schedule_ids)} schedules")
             
             # Delete all tweet schedules
             result = await self.scheduled_operations.delete_many({})
@@ -785,9 +961,16 @@ class RinDB:
         approved_item_ids: Optional[List[str]] = None,
         rejected_item_ids: Optional[List[str]] = None,
         schedule_info: Optional[Dict] = None,
-        metadata: Optional[Dict] = None
+        metadata: Optional[Dict] = None,
+        add_to_approved: Optional[List[str]] = None,
+        add_to_rejected: Optional[List[str]] = None,
+        remove_from_pending: Optional[List[str]] = None
     ) -> bool:
-        """Update a scheduled operation"""
+        """Update a scheduled operation.
+
+        The add_to_*/remove_from_* lists are applied atomically on the server, so
+        concurrent approvals don't need to read and rewrite the full ID lists.
+        """
         try:
             update_data = {}
             if state is not None:
@@ -805,15 +988,22 @@ class RinDB:
             if schedule_info is not None:
                 update_data["schedule_info"] = schedule_info
             if metadata is not None:
-                if "state_history" in metadata:
-                    update_data["state_history"] = metadata.pop("state_history")
-                update_data["metadata"] = {
-                    **update_data.get("metadata", {}),
-                    **metadata,
-                    "last_modified": datetime.now(UTC).isoformat()
-                }
+                # Dotted paths merge into the stored metadata instead of replacing it
+                for key, value in metadata.items():
+                    if key == "state_history":
+                        update_data["state_history"] = value
+                    else:
+                        update_data[f"metadata.{key}"] = value
+                update_data["metadata.last_modified"] = datetime.now(UTC).isoformat()
 
             final_update = {"$set": update_data}
+            if add_to_approved:
+                final_update.setdefault("$addToSet", {})["approved_items"] = {"$each": add_to_approved}
+            if add_to_rejected:
+                final_update.setdefault("$addToSet", {})["rejected_items"] = {"$each": add_to_rejected}
+            if remove_from_pending:
+                final_update["$pull"] = {"pending_items": {"$in": remove_from_pending}}
+
             result = await self.scheduled_operations.update_one(
                 {"_id": ObjectId(schedule_id) if ObjectId.is_valid(schedule_id) else schedule_id},
                 final_update
@@ -8,6 +8,7 @@ logger = logging.getLogger(__name__)
 class MongoManager:
     _instance: Optional[AsyncIOMotorClient] = None
     _db = None
+    _uri: Optional[str] = None
 
     @classmethod
     async def initialize(cls, mongo_uri: str, max_retries: int = 3):
@@ -19,16 +20,17 @@ class MongoManager:
         while retry_count < max_retries:
             try:
                 logger.info(f"Initializing MongoDB connection (attempt {retry_count + 1})")
-                cls._instance = AsyncIOMotorClient(mongo_uri)
+                # Import here to avoid circular import
+                from src.db.db_schema import RinDB
+                
+                # Use the shared client so services on this URI reuse one pool
+                cls._db = RinDB.get(mongo_uri)
+                cls._instance = cls._db.client
+                cls._uri = mongo_uri
                 
                 # Test connection
                 await cls._instance.admin.command('ping')
                 
-                # Import here to avoid circular import
-                from src.db.db_schema import RinDB
-                
-                # Initialize RinDB with the client
-                cls._db = RinDB(cls._instance)
                 await cls._db.initialize()
                 
                 logger.info("MongoDB connection and collections verified")
@@ -53,9 +55,12 @@ class MongoManager:
     async def close(cls):
         """Close MongoDB connection"""
         if cls._instance is not None:
+            from src.db.db_schema import RinDB
+            RinDB.close_shared(cls._uri)
             cls._instance.close()
             cls._instance = None
             cls._db = None
+            cls._uri = None
             logger.info("MongoDB connection closed")
 
     @classmethod
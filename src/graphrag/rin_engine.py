@@ -30,6 +30,10 @@ class RinResponseEnricher:
         
     async def initialize(self):
         """Initialize Neo4j and Voyage AI connections"""
+        # Already connected (enricher shared between agents)
+        if self.driver and self.voyage:
+            return True
+            
         try:
             # Initialize Neo4j driver
             if all([self.uri, self.username, self.password]):
@@ -13,6 +13,19 @@ class AgentAction(Enum):
     CANCEL_TOOL = "cancel_tool"       # TOOL_OPERATION -> NORMAL_CHAT
     ERROR = "error"                   # Any -> NORMAL_CHAT
 
+# Valid state transitions: (current state, action) -> next state
+_STATE_TRANSITIONS = {
+    (AgentState.NORMAL_CHAT, AgentAction.START_TOOL): AgentState.TOOL_OPERATION,
+    (AgentState.TOOL_OPERATION, AgentAction.COMPLETE_TOOL): AgentState.NORMAL_CHAT,
+    (AgentState.TOOL_OPERATION, AgentAction.CANCEL_TOOL): AgentState.NORMAL_CHAT,
+    (AgentState.TOOL_OPERATION, AgentAction.ERROR): AgentState.NORMAL_CHAT,
+    (AgentState.NORMAL_CHAT, AgentAction.ERROR): AgentState.NORMAL_CHAT,
+}
+
+# Response templates, copied and filled in per call
+_ERROR_TEMPLATE = {"state": None, "error": None, "status": "error"}
+_NORMAL_CHAT_TEMPLATE = {"state": None, "status": "normal_chat"}
+
 class AgentStateManager:
     def __init__(self, tool_state_manager, orchestrator, trigger_detector):
         self.current_state = AgentState.NORMAL_CHAT
@@ -21,19 +34,14 @@ class AgentStateManager:
         self.trigger_detector = trigger_detector
         self.active_operation = None
         self._current_tool_type = None  # Add tool type tracking
-        
-        # Define valid state transitions
-        self.state_transitions = {
-            (AgentState.NORMAL_CHAT, AgentAction.START_TOOL): AgentState.TOOL_OPERATION,
-            (AgentState.TOOL_OPERATION, AgentAction.COMPLETE_TOOL): AgentState.NORMAL_CHAT,
-            (AgentState.TOOL_OPERATION, AgentAction.CANCEL_TOOL): AgentState.NORMAL_CHAT,
-            (AgentState.TOOL_OPERATION, AgentAction.ERROR): AgentState.NORMAL_CHAT,
-            (AgentState.NORMAL_CHAT, AgentAction.ERROR): AgentState.NORMAL_CHAT,
-        }
 
     async def _transition_state(self, action: AgentAction, reason: str = "") -> bool:
         """Handle state transitions with validation"""
-        next_state = self.state_transitions.get((self.current_state, action))
+        # An error while chatting leaves the state unchanged
+        if action is AgentAction.ERROR and self.current_state is AgentState.NORMAL_CHAT:
+            return True
+
+        next_state = _STATE_TRANSITIONS.get((self.current_state, action))
         if next_state is None:
             logger.warning(f"Invalid state transition: {self.current_state} -> {action}")
             return False
@@ -57,11 +65,13 @@ class AgentStateManager:
                 tool_type = self.trigger_detector.get_specific_tool_type(message)
                 if tool_type:
                     try:
-                        # Transition to TOOL_OPERATION state BEFORE handling operation
-                        await self._transition_state(
-                            AgentAction.START_TOOL,
-                            f"Starting {tool_type} operation"
+                        # Transition to TOOL_OPERATION state BEFORE handling operation;
+                        # START_TOOL from NORMAL_CHAT always lands there
+                        logger.info(
+                            f"State transition: {self.current_state} -> {AgentState.TOOL_OPERATION} "
+                            f"(Starting {tool_type} operation)"
                         )
+                        self.current_state = AgentState.TOOL_OPERATION
                         
                         # Store tool_type for the session
                         self._current_tool_type = tool_type
@@ -100,8 +110,12 @@ class AgentStateManager:
                         
                         # Check for both "completed" and "cancelled" status, as well as "exit" status
                         if operation_status in ["completed", "cancelled", "exit"]:
-                            action = AgentAction.COMPLETE_TOOL if operation_status in ["completed", "exit"] else AgentAction.CANCEL_TOOL
-                            await self._transition_state(action, f"Operation {operation_status}")
+                            # COMPLETE_TOOL and CANCEL_TOOL from TOOL_OPERATION both return to NORMAL_CHAT
+                            logger.info(
+                                f"State transition: {self.current_state} -> {AgentState.NORMAL_CHAT} "
+                                f"(Operation {operation_status})"
+                            )
+                            self.current_state = AgentState.NORMAL_CHAT
                             self._current_tool_type = None
                             logger.info(f"Transitioned to {self.current_state} after operation {operation_status}")
                         
@@ -116,10 +130,9 @@ class AgentStateManager:
                     return self._create_error_response(str(e))
 
             # Default response for NORMAL_CHAT
-            return {
-                "state": self.current_state.value,
-                "status": "normal_chat"
-            }
+            response = _NORMAL_CHAT_TEMPLATE.copy()
+            response["state"] = self.current_state.value
+            return response
 
         except Exception as e:
             logger.error(f"Error in state management: {e}")
@@ -128,8 +141,7 @@ class AgentStateManager:
 
     def _create_error_response(self, error_message: str) -> Dict:
         """Create standardized error response"""
-        return {
-            "state": self.current_state.value,
-            "error": error_message,
-            "status": "error"
-        } 
\ No newline at end of file
+        response = _ERROR_TEMPLATE.copy()
+        response["state"] = self.current_state.value
+        response["error"] = error_message
+        return response 
\ No newline at end of file
@@ -421,6 +421,7 @@ Format the response as JSON:
                     # Remove the first line (```json) and the last line (```)
                     response = '\n'.join(response.split('\n')[1:-1])
                 
+                now_iso = datetime.now(UTC).isoformat()  # Shared by every regenerated item
                 try:
                     generated_items = json.loads(response)
                     new_items_data = []
@@ -430,7 +431,7 @@ Format the response as JSON:
                             "content": item["content"],
                             "metadata": {
                                 **item.get("metadata", {}),
-                                "generated_at": datetime.now(UTC).isoformat(),
+                                "generated_at": now_iso,
                                 "regenerated": True,
                                 "fallback": True,
                                 "llm_generated": True
@@ -447,7 +448,7 @@ Format the response as JSON:
                         new_items_data.append({
                             "content": f"Regenerated content about {topic} (fallback item {i+1})",
                             "metadata": {
-                                "generated_at": datetime.now(UTC).isoformat(),
+                                "generated_at": now_iso,
                                 "regenerated": True,
                                 "fallback": True
                             }
@@ -476,10 +477,10 @@ Format the response as JSON:
                 }
             )
             
-            # Move new items to APPROVING state
-            for item in new_items:
-                await self.db.tool_items.update_one(
-                    {"_id": ObjectId(item["_id"])},
+            # Move new items to APPROVING state in one write
+            if new_items:
+                await self.db.tool_items.update_many(
+                    {"_id": {"$in": [ObjectId(item["_id"]) for item in new_items]}},
                     {"$set": {
                         "state": ToolOperationState.APPROVING.value,
                         "metadata.approval_started_at": datetime.now(UTC).isoformat()
@@ -9,6 +9,7 @@ from src.db.db_schema import (
 from src.db.enums import OperationStatus, ToolOperationState, ScheduleState
 from src.managers.tool_state_manager import ToolStateManager
 from bson.objectid import ObjectId
+from pymongo import UpdateOne
 from enum import Enum
 from src.tools.base import ToolRegistry
 
@@ -92,17 +93,20 @@ class ScheduleManager:
                 item_count=len(approved_items)
             )
 
-            # Update each approved item with scheduled status and time
-            for item, scheduled_time in zip(approved_items, scheduled_times):
-                await self.db.tool_items.update_one(
+            # Update each approved item with scheduled status and time in one batch
+            now = datetime.now(UTC)
+            await self.db.tool_items.bulk_write([
+                UpdateOne(
                     {"_id": item["_id"]},
                     {"$set": {
                         "status": OperationStatus.SCHEDULED.value,
                         "scheduled_time": scheduled_time,
-                        "metadata.scheduled_at": datetime.now(UTC).isoformat(),
-                        "last_updated": datetime.now(UTC)
+                        "metadata.scheduled_at": now.isoformat(),
+                        "last_updated": now
                     }}
                 )
+                for item, scheduled_time in zip(approved_items, scheduled_times)
+            ], ordered=False)
 
             # Update operation state to indicate scheduling is complete
             await self.tool_state_manager.update_operation_state(
@@ -211,6 +215,33 @@ class ScheduleManager:
             logger.error(f"Error updating item execution status: {e}")
             return False
 
+    def build_schedule_doc(
+        self,
+        tool_operation_id: str,
+        schedule_info: Dict,
+        content_type: str
+    ) -> Dict:
+        """Build a schedule document as initialize_schedule leaves it, without writing it"""
+        schedule_doc = self.db.build_scheduled_operation(
+            tool_operation_id=tool_operation_id,
+            content_type=content_type,
+            schedule_info=schedule_info
+        )
+        now = schedule_doc["last_updated"]
+        schedule_doc["_id"] = ObjectId()
+        schedule_doc["state_history"] = [{
+            "state": ScheduleState.PENDING.value,
+            "timestamp": now.isoformat(),
+            "reason": f"{ScheduleAction.INITIALIZE.value}: Schedule initialized with pending items"
+        }]
+        schedule_doc["metadata"] = {
+            "tool_operation_id": tool_operation_id,
+            "content_type": content_type,
+            "schedule_info": schedule_info,
+            "last_modified": now.isoformat()
+        }
+        return schedule_doc
+
     async def initialize_schedule(
         self,
         tool_operation_id: str,
@@ -229,30 +260,14 @@ class ScheduleManager:
                 if not session_id:
                     raise ValueError(f"No session_id found for operation {tool_operation_id}")
 
-            # Create schedule using db_schema's method
-            schedule_id = await self.db.create_scheduled_operation(
+            # Create the schedule already in its initialized state
+            schedule_doc = self.build_schedule_doc(
                 tool_operation_id=tool_operation_id,
-                content_type=content_type,
-                schedule_info=schedule_info
-            )
-
-            # Initialize state_history as an array
-            await self.db.scheduled_operations.update_one(
-                {"_id": ObjectId(schedule_id)},
-                {"$set": {"state_history": []}}
-            )
-
-            # Track state transition
-            await self._transition_schedule_state(
-                schedule_id=schedule_id,
-                action=ScheduleAction.INITIALIZE,
-                reason="Schedule initialized with pending items",
-                metadata={
-                    "tool_operation_id": tool_operation_id,
-                    "content_type": content_type,
-                    "schedule_info": schedule_info
-                }
+                schedule_info=schedule_info,
+                content_type=content_type
             )
+            await self.db.scheduled_operations.insert_one(schedule_doc)
+            schedule_id = str(schedule_doc["_id"])
 
             # Update tool operation with schedule reference
             await self.tool_state_manager.update_operation(
@@ -351,6 +366,12 @@ class ScheduleManager:
                 
                 logger.info(f"Scheduled item {item['_id']} for execution at {scheduled_time.isoformat()}, type: {'monitored' if is_limit_order else 'time_based'}")
 
+            # Monitored items have no last check yet, so a woken monitoring loop checks them right away
+            if self.monitoring_service and any(
+                item.get('content_type') == ContentType.LIMIT_ORDER.value for item in items
+            ):
+                self.monitoring_service.notify_order_activated()
+
             # 5. Fix state history format - ensure it's an array
             # First check if state_history exists and is an array
             schedule_doc = await self.db.scheduled_operations.find_one({"_id": ObjectId(schedule_id)})
@@ -1,7 +1,12 @@
-from typing import Dict, Optional, Any, List, Union
+from typing import Dict, Optional, Any, List, Union, Iterable, AsyncIterator
 from datetime import datetime, UTC
+from collections import OrderedDict
+from functools import lru_cache
+import asyncio
+import copy
 import logging
 from bson.objectid import ObjectId
+from pymongo import ReturnDocument
 from src.db.enums import (
     OperationStatus,
     ToolOperationState,
@@ -12,7 +17,155 @@ from src.utils.trigger_detector import TriggerDetector
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=1024)
+def _to_oid(value: str) -> ObjectId:
+    """ObjectId for an operation ID; operations are looked up many times over their lifecycle"""
+    return ObjectId(value)
+
+# Enum values as plain strings, used throughout instead of repeated .value lookups
+_S_APPROVING = ToolOperationState.APPROVING.value
+_S_CANCELLED = ToolOperationState.CANCELLED.value
+_S_COLLECTING = ToolOperationState.COLLECTING.value
+_S_COMPLETED = ToolOperationState.COMPLETED.value
+_S_ERROR = ToolOperationState.ERROR.value
+_S_EXECUTING = ToolOperationState.EXECUTING.value
+_S_INACTIVE = ToolOperationState.INACTIVE.value
+
+_ST_APPROVED = OperationStatus.APPROVED.value
+_ST_EXECUTED = OperationStatus.EXECUTED.value
+_ST_FAILED = OperationStatus.FAILED.value
+_ST_PENDING = OperationStatus.PENDING.value
+_ST_REJECTED = OperationStatus.REJECTED.value
+_ST_SCHEDULED = OperationStatus.SCHEDULED.value
+
+_SCH_ACTIVE = ScheduleState.ACTIVE.value
+_SCH_CANCELLED = ScheduleState.CANCELLED.value
+_SCH_ERROR = ScheduleState.ERROR.value
+_SCH_PENDING = ScheduleState.PENDING.value
+
+# Valid state transitions, keyed and valued by state value strings
+_VALID_TRANSITIONS = {
+    _S_INACTIVE: frozenset({
+        _S_COLLECTING
+    }),
+    _S_COLLECTING: frozenset({
+        _S_APPROVING,
+        _S_EXECUTING,
+        _S_ERROR  # Allow error from collecting
+    }),
+    _S_APPROVING: frozenset({
+        _S_EXECUTING,
+        _S_CANCELLED,
+        _S_ERROR  # Allow error from approving
+    }),
+    _S_EXECUTING: frozenset({
+        _S_COMPLETED,
+        _S_ERROR
+    }),
+    _S_COMPLETED: frozenset(),  # Terminal state
+    _S_ERROR: frozenset(),      # Terminal state
+    _S_CANCELLED: frozenset()   # Terminal state
+}
+
+# Step name reported for each state
+_STEP_MAPPING = {
+    ToolOperationState.INACTIVE: "inactive",
+    ToolOperationState.COLLECTING: "collecting",
+    ToolOperationState.APPROVING: "awaiting_approval",
+    ToolOperationState.EXECUTING: "executing",
+    ToolOperationState.COMPLETED: "completed",
+    ToolOperationState.CANCELLED: "cancelled",
+    ToolOperationState.ERROR: "error"
+}
+_STEP_BY_STATE_VALUE = {state.value: step for state, step in _STEP_MAPPING.items()}
+
+# Fields update_operation reads to validate an update
+_UPDATE_OPERATION_FIELDS = {
+    "session_id": 1,
+    "state": 1,
+    "metadata.requires_scheduling": 1,
+    "output_data.schedule_id": 1
+}
+
+# Item state bits for _determine_operation_status
+_BIT_COLLECTING = 1
+_BIT_APPROVING = 2
+_BIT_EXECUTING = 4
+_BIT_COMPLETED = 8
+_BIT_CANCELLED = 16
+_BIT_ERROR = 32
+_BIT_OTHER = 64
+_BITS_IN_PROGRESS = _BIT_COLLECTING | _BIT_APPROVING | _BIT_EXECUTING
+_STATE_BIT = {
+    _S_COLLECTING: _BIT_COLLECTING,
+    _S_APPROVING: _BIT_APPROVING,
+    _S_EXECUTING: _BIT_EXECUTING,
+    _S_COMPLETED: _BIT_COMPLETED,
+    _S_CANCELLED: _BIT_CANCELLED,
+    _S_ERROR: _BIT_ERROR
+}
+
+# Item state implied by an operation status
+_STATUS_TO_STATE_MAP = {
+    _ST_APPROVED: _S_EXECUTING,
+    _ST_SCHEDULED: _S_EXECUTING,
+    _ST_EXECUTED: _S_COMPLETED,
+    _ST_REJECTED: _S_CANCELLED,
+    _ST_FAILED: _S_ERROR
+}
+
+# Item states/statuses counted by update_operation_state, keyed to their summary names
+_TALLIED_STATES = {
+    _S_COLLECTING: "collecting",
+    _S_APPROVING: "approving",
+    _S_EXECUTING: "executing",
+    _S_COMPLETED: "completed"
+}
+_TALLIED_STATUSES = {
+    _ST_PENDING: "pending",
+    _ST_APPROVED: "approved",
+    _ST_SCHEDULED: "scheduled",
+    _ST_EXECUTED: "executed"
+}
+_ITEM_TALLY_FIELDS = {"_id": 0, "state": 1, "status": 1}
+
+def _new_item_tally() -> Dict:
+    """Empty item counts in the shape stored under metadata.item_summary"""
+    return {
+        "total": 0,
+        "by_state": dict.fromkeys(_TALLIED_STATES.values(), 0),
+        "by_status": dict.fromkeys(_TALLIED_STATUSES.values(), 0)
+    }
+
+def _tally_item(tally: Dict, item: Dict) -> None:
+    """Count one item into a tally in place"""
+    tally["total"] += 1
+    state = _TALLIED_STATES.get(item["state"])
+    if state:
+        tally["by_state"][state] += 1
+    status = _TALLIED_STATUSES.get(item["status"])
+    if status:
+        tally["by_status"][status] += 1
+
+# Final operation state for a resolved status; anything else ends in ERROR
+_STATUS_TO_FINAL_STATE = {
+    OperationStatus.APPROVED: _S_COMPLETED,
+    OperationStatus.FAILED: _S_ERROR,
+    OperationStatus.REJECTED: _S_CANCELLED
+}
+
+@lru_cache(maxsize=None)
+def _warn_unhandled_status(status: OperationStatus) -> None:
+    """Log an unhandled final status once per process"""
+    logger.warning(f"Unhandled status {status} when determining final state")
+
 class ToolStateManager:
+    # Recently read/written operation documents kept per instance
+    OP_CACHE_SIZE = 256
+
+    # Most recent metadata.state_history entries kept per operation
+    STATE_HISTORY_LIMIT = 100
+
     def __init__(self, db: RinDB, schedule_service=None):
         """Initialize tool state manager with database connection"""
         logger.info("Initializing ToolStateManager...")
@@ -26,32 +179,9 @@ class ToolStateManager:
         self.schedule_service = schedule_service
         self.operations = {}
         self.trigger_detector = TriggerDetector()  # Initialize the trigger detector
+        self._op_cache: "OrderedDict[str, Dict]" = OrderedDict()
         logger.info("ToolStateManager initialized with database connection")
 
-        # Define valid state transitions
-        self.valid_transitions = {
-            ToolOperationState.INACTIVE.value: [
-                ToolOperationState.COLLECTING.value
-            ],
-            ToolOperationState.COLLECTING.value: [
-                ToolOperationState.APPROVING.value,
-                ToolOperationState.EXECUTING.value,
-                ToolOperationState.ERROR.value  # Allow error from collecting
-            ],
-            ToolOperationState.APPROVING.value: [
-                ToolOperationState.EXECUTING.value,
-                ToolOperationState.CANCELLED.value,
-                ToolOperationState.ERROR.value  # Allow error from approving
-            ],
-            ToolOperationState.EXECUTING.value: [
-                ToolOperationState.COMPLETED.value,
-                ToolOperationState.ERROR.value
-            ],
-            ToolOperationState.COMPLETED.value: [],  # Terminal state
-            ToolOperationState.ERROR.value: [],      # Terminal state
-            ToolOperationState.CANCELLED.value: []   # Terminal state
-        }
-
     async def start_operation(
         self,
         session_id: str,
@@ -71,11 +201,12 @@ class ToolStateManager:
             requires_scheduling = tool_registry.get("requires_scheduling", initial_data.get("requires_scheduling", False))
             content_type = tool_registry.get("content_type", initial_data.get("content_type"))
             
+            now = datetime.now(UTC)
             operation_data = {
                 "_id": ObjectId(tool_operation_id),
                 "session_id": session_id,
                 "tool_type": tool_type,
-                "state": ToolOperationState.COLLECTING.value,
+                "state": _S_COLLECTING,
                 "step": "analyzing",
                 "input_data": {
                     "command": initial_data.get("command"),
@@ -84,7 +215,7 @@ class ToolStateManager:
                     "schedule_info": initial_data.get("schedule_info")
                 },
                 "output_data": {
-                    "status": OperationStatus.PENDING.value,
+                    "status": _ST_PENDING,
                     "content": [],
                     "requires_approval": requires_approval,
                     "pending_items": [],
@@ -94,23 +225,24 @@ class ToolStateManager:
                 },
                 "metadata": {
                     "state_history": [{
-                        "state": ToolOperationState.COLLECTING.value,
+                        "state": _S_COLLECTING,
                         "step": "analyzing",
-                        "timestamp": datetime.now(UTC).isoformat()
+                        "timestamp": now.isoformat()
                     }],
                     "item_states": {},
                     "requires_scheduling": requires_scheduling,
                     "content_type": content_type,
                     "generation_phase": "initializing",
-                    "schedule_state": ScheduleState.PENDING.value if requires_scheduling else None
+                    "schedule_state": _SCH_PENDING if requires_scheduling else None
                 },
-                "created_at": datetime.now(UTC),
-                "last_updated": datetime.now(UTC)
+                "created_at": now,
+                "last_updated": now
             }
             
             # Create new operation
             result = await self.db.tool_operations.insert_one(operation_data)
             operation_data['_id'] = result.inserted_id
+            self._cache_operation(tool_operation_id, operation_data)
             
             logger.info(f"Started {tool_type} operation {tool_operation_id} for session {session_id}")
             return operation_data
@@ -133,16 +265,24 @@ class ToolStateManager:
         """Update tool operation with new data"""
         try:
             # Validate operation exists and belongs to session
-            current_op = await self.db.tool_operations.find_one({
-                "_id": ObjectId(tool_operation_id),
-                "session_id": session_id
-            })
+            current_op = self._cached_operation(tool_operation_id)
+            from_cache = bool(current_op) and current_op.get("session_id") == session_id
+            if not from_cache:
+                current_op = await self.db.tool_operations.find_one(
+                    {"_id": _to_oid(tool_operation_id), "session_id": session_id},
+                    projection=_UPDATE_OPERATION_FIELDS
+                )
+                if current_op:
+                    self._cache_operation(tool_operation_id, current_op)
+                    current_op = self._op_cache[tool_operation_id]
             
             if not current_op:
                 logger.error(f"No operation found for ID {tool_operation_id} and session {session_id}")
                 return False
 
-            update_data = {"last_updated": datetime.now(UTC)}
+            now = datetime.now(UTC)
+            update_data = {"last_updated": now}
+            history_entries = []
             
             # Validate state transition if state is being updated
             if state:
@@ -150,80 +290,142 @@ class ToolStateManager:
                 if not self._is_valid_transition(current_state, state):
                     logger.warning(
                         f"Invalid state transition from {current_state} to {state}. "
-                        f"Valid transitions are: {self.valid_transitions.get(current_state, [])}"
+                        f"Valid transitions are: {sorted(_VALID_TRANSITIONS.get(current_state, ()))}"
                     )
                     return False
                 update_data["state"] = state
-                
-                # Handle schedule state updates if this is a scheduled operation
-                if current_op.get("metadata", {}).get("requires_scheduling"):
-                    schedule_id = current_op.get("output_data", {}).get("schedule_id")
-                    if schedule_id:
-                        if state == ToolOperationState.COMPLETED.value:
-                            await self.db.update_schedule_state(
-                                schedule_id=schedule_id,
-                                state=ScheduleState.ACTIVE.value
-                            )
-                        elif state in [ToolOperationState.CANCELLED.value, ToolOperationState.ERROR.value]:
-                            await self.db.update_schedule_state(
-                                schedule_id=schedule_id,
-                                state=ScheduleState.CANCELLED.value if state == ToolOperationState.CANCELLED.value else ScheduleState.ERROR.value
-                            )
+                history_entries.append({
+                    "state": state,
+                    "step": step or self._get_step_for_state(state),
+                    "timestamp": now.isoformat()
+                })
                 
             if step:
                 update_data["step"] = step
                 
+            # Subdocument updates merge server-side through dotted paths
             if content_updates:
                 # Merge with existing output_data
-                existing_output = current_op.get("output_data", {})
-                update_data["output_data"] = {
-                    **existing_output,
-                    **content_updates
-                }
+                for key, value in content_updates.items():
+                    update_data[f"output_data.{key}"] = value
                 
             if metadata:
-                # Merge with existing metadata
-                existing_metadata = current_op.get("metadata", {})
-                update_data["metadata"] = {
-                    **existing_metadata,
-                    **metadata,
-                    "last_modified": datetime.now(UTC).isoformat()
-                }
+                # Merge with existing metadata; caller state_history entries are appended through $push
+                for key, value in metadata.items():
+                    if key == "state_history":
+                        history_entries.extend(value if isinstance(value, list) else [value])
+                    else:
+                        update_data[f"metadata.{key}"] = value
+                update_data["metadata.last_modified"] = now.isoformat()
 
             if input_data:
                 # Merge with existing input_data
-                existing_input = current_op.get("input_data", {})
-                update_data["input_data"] = {
-                    **existing_input,
-                    **input_data
-                }
+                for key, value in input_data.items():
+                    update_data[f"input_data.{key}"] = value
 
-            if output_data:
+            if output_data and not content_updates:
                 # Merge with existing output_data if not already updated
-                if "output_data" not in update_data:
-                    existing_output = current_op.get("output_data", {})
-                    update_data["output_data"] = {
-                        **existing_output,
-                        **output_data
-                    }
+                for key, value in output_data.items():
+                    update_data[f"output_data.{key}"] = value
                 
             # Update operation
-            result = await self.db.tool_operations.update_one(
-                {
-                    "_id": ObjectId(tool_operation_id),
-                    "session_id": session_id
-                },
-                {"$set": update_data}
-            )
+            update = {"$set": update_data}
+            update_filter = {
+                "_id": _to_oid(tool_operation_id),
+                "session_id": session_id
+            }
+            if history_entries:
+                update["$push"] = self._state_history_push(history_entries)
+            if state:
+                # Only apply the transition if the stored state is still the one validated above
+                update_filter["state"] = current_state
+            result = await self.db.tool_operations.update_one(update_filter, update)
             
-            return result.modified_count > 0
+            if result.modified_count == 0 and from_cache:
+                # The cached copy was stale; validate again against a fresh read
+                self._invalidate_operation(tool_operation_id)
+                return await self.update_operation(
+                    session_id=session_id,
+                    tool_operation_id=tool_operation_id,
+                    state=state,
+                    step=step,
+                    content_updates=content_updates,
+                    metadata=metadata,
+                    input_data=input_data,
+                    output_data=output_data
+                )
+
+            if result.modified_count > 0:
+                # Handle schedule state updates if this is a scheduled operation
+                if state and current_op.get("metadata", {}).get("requires_scheduling"):
+                    schedule_id = current_op.get("output_data", {}).get("schedule_id")
+                    if schedule_id:
+                        if state == _S_COMPLETED:
+                            await self.db.update_schedule_state(
+                                schedule_id=schedule_id,
+                                state=_SCH_ACTIVE
+                            )
+                        elif state in [_S_CANCELLED, _S_ERROR]:
+                            await self.db.update_schedule_state(
+                                schedule_id=schedule_id,
+                                state=_SCH_CANCELLED if state == _S_CANCELLED else _SCH_ERROR
+                            )
+
+                # Keep the cached copy in step with what was just written
+                for path, value in update_data.items():
+                    field, _, key = path.partition(".")
+                    if key:
+                        current_op.setdefault(field, {})[key] = value
+                    else:
+                        current_op[field] = value
+                cached_history = current_op.get("metadata", {}).get("state_history")
+                if history_entries and cached_history is not None:
+                    cached_history.extend(history_entries)
+                    del cached_history[:-self.STATE_HISTORY_LIMIT]
+                return True
+            self._invalidate_operation(tool_operation_id)
+            return False
 
         except Exception as e:
+            self._invalidate_operation(tool_operation_id)
             logger.error(f"Error updating operation: {e}")
             return False
 
-    async def get_operation(self, session_id: str) -> Optional[ToolOperation]:
-        """Get current operation state"""
+    def _state_history_push(self, entries: List[Dict]) -> Dict:
+        """$push clause appending to metadata.state_history, keeping it bounded"""
+        return {
+            "metadata.state_history": {
+                "$each": entries,
+                "$slice": -self.STATE_HISTORY_LIMIT
+            }
+        }
+
+    def _cached_operation(self, tool_operation_id: str) -> Optional[Dict]:
+        """Get a cached operation document, marking it recently used"""
+        operation = self._op_cache.get(tool_operation_id)
+        if operation is not None:
+            self._op_cache.move_to_end(tool_operation_id)
+        return operation
+
+    def _cache_operation(self, tool_operation_id: str, operation: Dict) -> None:
+        """Cache a private copy of an operation document"""
+        self._op_cache[tool_operation_id] = copy.deepcopy(operation)
+        self._op_cache.move_to_end(tool_operation_id)
+        while len(self._op_cache) > self.OP_CACHE_SIZE:
+            self._op_cache.popitem(last=False)
+
+    def _invalidate_operation(self, tool_operation_id: str) -> None:
+        """Drop an operation document whose stored copy changed elsewhere"""
+        self._op_cache.pop(str(tool_operation_id), None)
+
+    async def get_operation(
+        self,
+        session_id: str,
+        fields: Optional[List[str]] = None
+    ) -> Optional[ToolOperation]:
+        """Get current operation state, optionally only the given fields"""
+        if fields:
+            return await self.db.get_tool_operation_state(session_id, fields=fields)
         return await self.db.get_tool_operation_state(session_id)
 
     async def end_operation(
@@ -236,23 +438,11 @@ class ToolStateManager:
     ) -> Dict:
         """End an operation with success or failure"""
         try:
-            # Get current operation if tool_operation_id not provided
-            if not tool_operation_id:
-                operation = await self.get_operation(session_id)
-                if not operation:
-                    raise ValueError(f"No active operation found for session {session_id}")
-                tool_operation_id = str(operation["_id"])
-            else:
-                # Get operation by ID if provided
-                operation = await self.get_operation_by_id(tool_operation_id)
-                if not operation:
-                    raise ValueError(f"No operation found with ID {tool_operation_id}")
-            
-            logger.info(f"Ending operation {tool_operation_id} with success={success}")
+            logger.info(f"Ending operation {tool_operation_id or 'for session ' + session_id} with success={success}")
             
             # Update operation state
             update_data = {
-                "state": ToolOperationState.COMPLETED.value if success else ToolOperationState.ERROR.value,
+                "state": _S_COMPLETED if success else _S_ERROR,
                 "step": step,
                 "metadata.completion_time": datetime.now(UTC).isoformat(),
                 "metadata.final_status": "success" if success else "error"
@@ -265,14 +455,24 @@ class ToolStateManager:
                 if api_response.get("content_type"):
                     update_data["metadata.content_type"] = api_response.get("content_type")
             
-            # Update operation
-            await self.db.tool_operations.update_one(
-                {"_id": ObjectId(tool_operation_id)},
-                {"$set": update_data}
+            # Update and read back in one round-trip; without an ID the session's operation is used
+            query = {"_id": _to_oid(tool_operation_id)} if tool_operation_id else {"session_id": session_id}
+            history_entry = {
+                "state": update_data["state"],
+                "step": step,
+                "timestamp": update_data["metadata.completion_time"]
+            }
+            updated_operation = await self.db.tool_operations.find_one_and_update(
+                query,
+                {"$set": update_data, "$push": self._state_history_push([history_entry])},
+                return_document=ReturnDocument.AFTER
             )
+            if not updated_operation:
+                if tool_operation_id:
+                    raise ValueError(f"No operation found with ID {tool_operation_id}")
+                raise ValueError(f"No active operation found for session {session_id}")
             
-            # Get updated operation
-            updated_operation = await self.get_operation_by_id(tool_operation_id)
+            self._cache_operation(str(updated_operation["_id"]), updated_operation)
             return updated_operation
             
         except Exception as e:
@@ -282,12 +482,12 @@ class ToolStateManager:
     def _determine_final_state(self, success: bool, current_state: str) -> str:
         """Determine final ToolOperationState based on success and current state"""
         if not success:
-            return ToolOperationState.ERROR.value
+            return _S_ERROR
             
-        if current_state == ToolOperationState.CANCELLED.value:
-            return ToolOperationState.CANCELLED.value
+        if current_state == _S_CANCELLED:
+            return _S_CANCELLED
             
-        return ToolOperationState.COMPLETED.value
+        return _S_COMPLETED
 
     def _determine_final_status(
         self,
@@ -297,60 +497,47 @@ class ToolStateManager:
     ) -> str:
         """Determine final OperationStatus based on operation type and success"""
         if not success:
-            return OperationStatus.FAILED.value
+            return _ST_FAILED
             
-        if current_status == OperationStatus.REJECTED.value:
-            return OperationStatus.REJECTED.value
+        if current_status == _ST_REJECTED:
+            return _ST_REJECTED
             
         if requires_scheduling:
-            return OperationStatus.SCHEDULED.value
+            return _ST_SCHEDULED
             
-        return OperationStatus.EXECUTED.value
+        return _ST_EXECUTED
 
     def _is_valid_transition(self, current_state: str, new_state: str) -> bool:
         """Check if state transition is valid"""
         if current_state == new_state:
             return True
         
-        if current_state not in self.valid_transitions:
+        if current_state not in _VALID_TRANSITIONS:
             logger.error(f"Invalid current state: {current_state}")
             return False
         
-        valid_next_states = self.valid_transitions[current_state]
+        valid_next_states = _VALID_TRANSITIONS[current_state]
         is_valid = new_state in valid_next_states
         
         if not is_valid:
             logger.warning(
                 f"Invalid state transition from {current_state} to {new_state}. "
-                f"Valid transitions are: {valid_next_states}"
+                f"Valid transitions are: {sorted(valid_next_states)}"
             )
         
         return is_valid
 
-    def _get_step_for_state(self, state: ToolOperationState) -> str:
-        """Get appropriate step name for state"""
-        step_mapping = {
-            ToolOperationState.INACTIVE: "inactive",
-            ToolOperationState.COLLECTING: "collecting",
-            ToolOperationState.APPROVING: "awaiting_approval",
-            ToolOperationState.EXECUTING: "executing",
-            ToolOperationState.COMPLETED: "completed",
-            ToolOperationState.CANCELLED: "cancelled",
-            ToolOperationState.ERROR: "error"
-        }
-        return step_mapping.get(state, "unknown")
-
-    def _get_final_state(self, current_state: str, status: OperationStatus) -> str:
-        """Determine final state based on current state and status"""
-        if status == OperationStatus.APPROVED:
-            return ToolOperationState.COMPLETED.value
-        elif status == OperationStatus.FAILED:
-            return ToolOperationState.ERROR.value
-        elif status == OperationStatus.REJECTED:
-            return ToolOperationState.CANCELLED.value
-        else:
-            logger.warning(f"Unhandled status {status} in state {current_state}")
-            return ToolOperationState.ERROR.value
+    def _get_step_for_state(self, state: Union[ToolOperationState, str]) -> str:
+        """Get appropriate step name for state (enum member or its value)"""
+        return _STEP_BY_STATE_VALUE.get(getattr(state, "value", state), "unknown")
+
+    def _get_final_state(self, status: OperationStatus) -> str:
+        """Determine final state based on status"""
+        final_state = _STATUS_TO_FINAL_STATE.get(status)
+        if final_state is None:
+            _warn_unhandled_status(status)
+            return _S_ERROR
+        return final_state
 
     async def get_operation_state(self, session_id: str) -> Optional[Dict]:
         """Get current operation state"""
@@ -363,21 +550,32 @@ class ToolStateManager:
     async def validate_operation_items(self, tool_operation_id: str) -> bool:
         """Validate all items are properly linked to operation"""
         try:
-            operation = await self.db.tool_operations.find_one({"_id": ObjectId(tool_operation_id)})
-            if not operation:
+            # Compare pending_items with the linked item IDs server-side
+            results = await self.db.tool_operations.aggregate([
+                {"$match": {"_id": _to_oid(tool_operation_id)}},
+                # Operations without pending items compare as an empty set
+                {"$project": {"pending_items": {"$ifNull": ["$output_data.pending_items", []]}}},
+                {"$lookup": {
+                    "from": self.db.tool_items.name,
+                    "pipeline": [
+                        {"$match": {"tool_operation_id": tool_operation_id}},
+                        {"$project": {"_id": 1}}
+                    ],
+                    "as": "items"
+                }},
+                {"$project": {
+                    "_id": 0,
+                    "ok": {"$setEquals": [
+                        "$pending_items",
+                        {"$map": {"input": "$items", "in": {"$toString": "$$this._id"}}}
+                    ]}
+                }}
+            ]).to_list(1)
+            if not results:
                 return False
 
-            # Get all items for this operation
-            items = await self.db.tool_items.find({
-                "tool_operation_id": tool_operation_id
-            }).to_list(None)
-
-            # Validate items match operation's pending_items
-            pending_ids = set(operation["output_data"]["pending_items"])
-            item_ids = {str(item["_id"]) for item in items}
-            
-            if pending_ids != item_ids:
-                logger.error(f"Mismatch in operation items. Expected: {pending_ids}, Found: {item_ids}")
+            if not results[0]["ok"]:
+                logger.error(f"Mismatch in operation items for operation {tool_operation_id}")
                 return False
 
             return True
@@ -389,7 +587,9 @@ class ToolStateManager:
     async def get_operation_by_id(self, tool_operation_id: str) -> Optional[Dict]:
         """Get operation by ID"""
         try:
-            operation = await self.db.tool_operations.find_one({"_id": ObjectId(tool_operation_id)})
+            operation = await self.db.tool_operations.find_one({"_id": _to_oid(tool_operation_id)})
+            if operation:
+                self._cache_operation(str(tool_operation_id), operation)
             return operation
         except Exception as e:
             logger.error(f"Error getting operation by ID: {e}")
@@ -398,15 +598,15 @@ class ToolStateManager:
     async def update_operation_items(
         self,
         tool_operation_id: str,
-        item_ids: List[str],
+        item_ids: List[Union[str, ObjectId]],
         new_state: str,
         new_status: str
     ) -> bool:
-        """Update state and status for specific items in an operation"""
+        """Update state and status for specific items in an operation (IDs may be ObjectIds)"""
         try:
             result = await self.db.tool_items.update_many(
                 {
-                    "_id": {"$in": [ObjectId(id) for id in item_ids]},
+                    "_id": {"$in": item_ids if all(isinstance(id, ObjectId) for id in item_ids) else list(map(ObjectId, item_ids))},
                     "tool_operation_id": tool_operation_id
                 },
                 {
@@ -454,10 +654,45 @@ class ToolStateManager:
             logger.error(f"Error getting operation items: {e}")
             return []
 
-    async def update_operation_state(self, tool_operation_id: str, item_updates: Optional[List[Dict]] = None) -> bool:
+    async def iter_operation_items(
+        self,
+        tool_operation_id: str,
+        projection: Optional[Dict] = None
+    ) -> AsyncIterator[Dict]:
+        """Stream items for a tool operation without loading them all at once"""
+        cursor = self.db.tool_items.find(
+            {"tool_operation_id": tool_operation_id},
+            projection=projection
+        )
+        async for item in cursor:
+            yield item
+
+    async def _tally_operation_items(self, tool_operation_id: str) -> Dict:
+        """Count an operation's items by state and status from a projected cursor"""
+        tally = _new_item_tally()
+        async for item in self.iter_operation_items(tool_operation_id, projection=_ITEM_TALLY_FIELDS):
+            _tally_item(tally, item)
+        return tally
+
+    async def update_operation_state(
+        self,
+        tool_operation_id: str,
+        item_updates: Optional[List[Dict]] = None,
+        _retry: bool = True
+    ) -> bool:
         """Update operation state based on item states and scheduling requirements"""
         try:
-            operation = await self.get_operation_by_id(tool_operation_id)
+            # The operation and its item counts are independent reads
+            if item_updates:
+                operation = await self.get_operation_by_id(tool_operation_id)
+                tally = _new_item_tally()
+                for item in item_updates:
+                    _tally_item(tally, item)
+            else:
+                operation, tally = await asyncio.gather(
+                    self.get_operation_by_id(tool_operation_id),
+                    self._tally_operation_items(tool_operation_id)
+                )
             if not operation:
                 return False
 
@@ -469,81 +704,77 @@ class ToolStateManager:
             current_state = operation.get('state')
 
             # For one-shot tools, transition directly to COMPLETED
-            if is_one_shot and current_state == ToolOperationState.COLLECTING.value:
-                new_state = ToolOperationState.COMPLETED.value
+            if is_one_shot and current_state == _S_COLLECTING:
+                new_state = _S_COMPLETED
                 await self.db.tool_operations.update_one(
-                    {"_id": ObjectId(tool_operation_id)},
+                    {"_id": _to_oid(tool_operation_id)},
                     {
                         "$set": {
                             "state": new_state,
-                            "status": OperationStatus.EXECUTED.value,
+                            "status": _ST_EXECUTED,
                             "metadata.last_state_update": datetime.now(UTC).isoformat()
                         }
                     }
                 )
+                self._invalidate_operation(tool_operation_id)
                 return True
 
             # Regular state progression for non-one-shot tools
-            items = item_updates or await self.get_operation_items(tool_operation_id)
             is_scheduled_operation = operation.get('metadata', {}).get('requires_scheduling', False)
 
-            # Count items by state
-            items_by_state = {
-                'collecting': [i for i in items if i['state'] == ToolOperationState.COLLECTING.value],
-                'approving': [i for i in items if i['state'] == ToolOperationState.APPROVING.value],
-                'executing': [i for i in items if i['state'] == ToolOperationState.EXECUTING.value],
-                'completed': [i for i in items if i['state'] == ToolOperationState.COMPLETED.value]
-            }
-
-            # Count items by status
-            items_by_status = {
-                'pending': [i for i in items if i['status'] == OperationStatus.PENDING.value],
-                'approved': [i for i in items if i['status'] == OperationStatus.APPROVED.value],
-                'scheduled': [i for i in items if i['status'] == OperationStatus.SCHEDULED.value],
-                'executed': [i for i in items if i['status'] == OperationStatus.EXECUTED.value]
-            }
+            # Item counts by state and status
+            items_by_state = tally["by_state"]
+            items_by_status = tally["by_status"]
 
             new_state = current_state
-            expected_item_count = operation.get('metadata', {}).get('expected_item_count', len(items))
+            expected_item_count = operation.get('metadata', {}).get('expected_item_count', tally["total"])
 
             # Determine new state based on operation type and item states
             if is_scheduled_operation:
-                if len(items_by_status['executed']) == expected_item_count:
-                    new_state = ToolOperationState.COMPLETED.value
-                elif len(items_by_status['scheduled']) == expected_item_count:
-                    new_state = ToolOperationState.EXECUTING.value  # Schedule is active
-                elif len(items_by_status['approved']) == expected_item_count:
+                if items_by_status['executed'] == expected_item_count:
+                    new_state = _S_COMPLETED
+                elif items_by_status['scheduled'] == expected_item_count:
+                    new_state = _S_EXECUTING  # Schedule is active
+                elif items_by_status['approved'] == expected_item_count:
                     # All items approved but not yet scheduled
-                    new_state = ToolOperationState.APPROVING.value
+                    new_state = _S_APPROVING
             else:
                 # Non-scheduled operation state progression
-                if len(items_by_state['completed']) == expected_item_count:
-                    new_state = ToolOperationState.COMPLETED.value
-                elif len(items_by_state['executing']) == expected_item_count:
-                    new_state = ToolOperationState.EXECUTING.value
+                if items_by_state['completed'] == expected_item_count:
+                    new_state = _S_COMPLETED
+                elif items_by_state['executing'] == expected_item_count:
+                    new_state = _S_EXECUTING
 
             # Only update if state has changed
             if new_state != current_state:
-                await self.db.tool_operations.update_one(
-                    {"_id": ObjectId(tool_operation_id)},
+                # Compare-and-set on the state read above so a concurrent transition isn't overwritten
+                result = await self.db.tool_operations.update_one(
+                    {"_id": _to_oid(tool_operation_id), "state": current_state},
                     {
                         "$set": {
                             "state": new_state,
                             "metadata.item_summary": {
                                 "total_items": expected_item_count,
-                                "by_state": {state: len(items) for state, items in items_by_state.items()},
-                                "by_status": {status: len(items) for status, items in items_by_status.items()},
+                                "by_state": items_by_state,
+                                "by_status": items_by_status,
                                 "requires_scheduling": is_scheduled_operation,
                                 "last_state_update": datetime.now(UTC).isoformat()
                             }
                         }
                     }
                 )
+                self._invalidate_operation(tool_operation_id)
+                if result.matched_count == 0:
+                    if _retry:
+                        logger.info(f"Operation {tool_operation_id} changed concurrently, re-evaluating")
+                        return await self.update_operation_state(tool_operation_id, item_updates, _retry=False)
+                    logger.warning(f"Operation {tool_operation_id} state changed concurrently, update skipped")
+                    return False
                 
                 logger.info(
                     f"Operation {tool_operation_id} state updated: {current_state} -> {new_state}. "
-                    f"Scheduled: {len(items_by_status['scheduled'])}, "
-                    f"Executed: {len(items_by_status['executed'])}, "
+                    f"Scheduled: {items_by_status['scheduled']}, "
+                    f"Executed: {items_by_status['executed']}, "
                     f"Total: {expected_item_count}"
                 )
 
@@ -553,26 +784,27 @@ class ToolStateManager:
             logger.error(f"Error updating operation state: {e}")
             return False
 
-    def _determine_operation_status(self, item_states: set) -> str:
+    def _determine_operation_status(self, item_states: Iterable[str]) -> str:
         """Determine operation status based on item states"""
+        # Single pass: collect which states are present as bits
+        mask = 0
+        for state in item_states:
+            mask |= _STATE_BIT.get(state, _BIT_OTHER)
+
         # If any items are still processing, operation remains PENDING
-        if any(state in {
-            ToolOperationState.COLLECTING.value,
-            ToolOperationState.APPROVING.value,
-            ToolOperationState.EXECUTING.value
-        } for state in item_states):
-            return OperationStatus.PENDING.value
+        if mask & _BITS_IN_PROGRESS:
+            return _ST_PENDING
             
         # All items must be in the same final state
-        if all(state == ToolOperationState.COMPLETED.value for state in item_states):
-            return OperationStatus.EXECUTED.value
-        elif all(state == ToolOperationState.CANCELLED.value for state in item_states):
-            return OperationStatus.REJECTED.value
-        elif all(state == ToolOperationState.ERROR.value for state in item_states):
-            return OperationStatus.FAILED.value
+        if not mask & ~_BIT_COMPLETED:
+            return _ST_EXECUTED
+        elif mask == _BIT_CANCELLED:
+            return _ST_REJECTED
+        elif mask == _BIT_ERROR:
+            return _ST_FAILED
             
         # Default to PENDING if mixed states
-        return OperationStatus.PENDING.value
+        return _ST_PENDING
 
     async def sync_items_to_operation_status(
         self,
@@ -580,16 +812,8 @@ class ToolStateManager:
         operation_status: str
     ) -> None:
         """Sync all items to match operation status"""
-        status_to_state_map = {
-            OperationStatus.APPROVED.value: ToolOperationState.EXECUTING.value,
-            OperationStatus.SCHEDULED.value: ToolOperationState.EXECUTING.value,
-            OperationStatus.EXECUTED.value: ToolOperationState.COMPLETED.value,
-            OperationStatus.REJECTED.value: ToolOperationState.CANCELLED.value,
-            OperationStatus.FAILED.value: ToolOperationState.ERROR.value
-        }
-        
-        if operation_status in status_to_state_map:
-            new_state = status_to_state_map[operation_status]
+        if operation_status in _STATUS_TO_STATE_MAP:
+            new_state = _STATUS_TO_STATE_MAP[operation_status]
             await self.db.tool_items.update_many(
                 {"tool_operation_id": tool_operation_id},
                 {
@@ -607,8 +831,8 @@ class ToolStateManager:
         items_data: List[Dict],
         content_type: str,
         schedule_id: Optional[str] = None,
-        initial_state: str = ToolOperationState.COLLECTING.value,
-        initial_status: str = OperationStatus.PENDING.value
+        initial_state: str = _S_COLLECTING,
+        initial_status: str = _ST_PENDING
     ) -> List[Dict]:
         """Create new tool items with proper state tracking"""
         try:
@@ -617,7 +841,8 @@ class ToolStateManager:
             if not operation:
                 raise ValueError(f"No operation found for ID {tool_operation_id}")
 
-            saved_items = []
+            tool_items = []
+            now_iso = datetime.now(UTC).isoformat()
             for item in items_data:
                 tool_item = {
                     "session_id": session_id,
@@ -633,20 +858,23 @@ class ToolStateManager:
                     },
                     "metadata": {
                         **item.get("metadata", {}),
-                        "created_at": datetime.now(UTC).isoformat(),
+                        "created_at": now_iso,
                         "state_history": [{
                             "state": initial_state,
                             "status": initial_status,
-                            "timestamp": datetime.now(UTC).isoformat()
+                            "timestamp": now_iso
                         }]
                     }
                 }
-                
-                result = await self.db.tool_items.insert_one(tool_item)
-                saved_item = {**tool_item, "_id": str(result.inserted_id)}
-                saved_items.append(saved_item)
-                
-                logger.info(f"Created tool item {saved_item['_id']} in {initial_state} state")
+                tool_items.append(tool_item)
+
+            # Save all items in one round-trip
+            saved_items = []
+            if tool_items:
+                result = await self.db.tool_items.insert_many(tool_items, ordered=False)
+                for tool_item, item_id in zip(tool_items, result.inserted_ids):
+                    saved_items.append({**tool_item, "_id": str(item_id)})
+                    logger.info(f"Created tool item {item_id} in {initial_state} state")
 
             # Update operation's pending items
             await self.update_operation(
@@ -679,8 +907,8 @@ class ToolStateManager:
                 raise ValueError(f"No operation found for ID {tool_operation_id}")
             
             if operation['state'] not in [
-                ToolOperationState.APPROVING.value,
-                ToolOperationState.COLLECTING.value
+                _S_APPROVING,
+                _S_COLLECTING
             ]:
                 raise ValueError(f"Operation in invalid state for regeneration: {operation['state']}")
 
@@ -691,8 +919,8 @@ class ToolStateManager:
                 items_data=items_data,
                 content_type=content_type,
                 schedule_id=schedule_id,
-                initial_state=ToolOperationState.COLLECTING.value,
-                initial_status=OperationStatus.PENDING.value
+                initial_state=_S_COLLECTING,
+                initial_status=_ST_PENDING
             )
 
             # Update operation metadata
@@ -154,3 +154,72 @@ Respond with valid JSON only:
     },
     "feedback": "Message explaining the action taken"
 }"""
+
+    INTENTS_LIMIT_ORDER = """You are a blockchain intents analyzer. Determine the limit order parameters for buying or selling a token based on the user's command.
+
+Command: "{command}"
+
+Required parameters for limit order:
+   - topic: what to swap (e.g., NEAR to USDC, USDC to NEAR)
+   - from_token: token to swap from (e.g., NEAR, USDC)
+   - from_amount: amount to swap
+   - to_token: token to swap to (e.g., NEAR, USDC)
+   - target_price_usd: target price in USD per from_token
+   - to_chain: chain for the output token (optional, defaults to "ethereum")
+   - expiration_hours: hours until order expires (optional, defaults to 24)
+   - slippage: slippage tolerance percentage (optional, defaults to 0.5)
+
+Instructions:
+- Return ONLY valid JSON matching the example format
+- Extract all token symbols, amounts, addresses, and chains if specified
+- For limit_order, min_price should be the minimum amount of to_token per from_token
+- If the user specifies a price like "$3.00 / NEAR", set min_price to 3.0
+- Follow the exact schema provided
+- Include NO additional text or markdown
+
+Example response format:
+{{
+    "tools_needed": [{{
+        "tool_name": "intents",
+        "action": "limit_order",
+        "parameters": {{
+            "topic": "NEAR to USDC",
+            "from_token": "NEAR",
+            "from_amount": 5.0,
+            "to_token": "USDC",
+            "target_price_usd": 3.0,
+            "to_chain": "ethereum",
+            "expiration_hours": 24,
+            "slippage": 0.5,
+            "destination_address": "0x7fe4A51B1e610dcf87f2669B03Ef9d4b66b85ca8", # optional
+            "destination_chain": "ethereum" # optional
+        }},
+        "priority": 1
+    }}],
+    "reasoning": "User requested a limit order to swap 5 NEAR to USDC when the price reaches $3.00 per NEAR"
+}}"""
+
+    LIMIT_ORDER_DESCRIPTION = """You are a cryptocurrency expert. Generate a detailed description for a limit order with the following parameters:
+
+Operation Details:
+- Swap {from_amount} {from_token} for {to_token}
+- Target Price: ${target_price_usd} per {from_token}
+- Output Chain: {to_chain}
+- Destination: {destination_address} on {destination_chain}
+- Expires in: {expiration_hours} hours
+
+Include:
+1. A clear title summarizing the limit order
+2. A detailed description of what will happen when executed
+3. Important warnings about market volatility and risks
+4. Expected outcome when price target is met
+
+IMPORTANT: Your response MUST be valid JSON in the following format:
+{{
+    "title": "Limit Order Summary",
+    "description": "Detailed description here...",
+    "warnings": ["Warning 1", "Warning 2"],
+    "expected_outcome": "Expected outcome description"
+}}
+
+Do not include any text outside of this JSON structure."""
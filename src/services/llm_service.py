@@ -3,7 +3,7 @@ from langchain_anthropic import ChatAnthropic
 import os
 import logging
 from enum import Enum
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator
 from dotenv import load_dotenv
 from openai import OpenAI
 from anthropic import AsyncAnthropic
@@ -227,6 +227,70 @@ class LLMService:
             logger.error(f"Prompt: {prompt}")
             return "Sorry, I encountered an error processing your request."
 
+    async def stream_response(
+        self,
+        prompt: str | list,
+        model_type: Optional[ModelType] = None,
+        override_config: Optional[Dict[str, Any]] = None,
+        config_type: str = "default"
+    ) -> AsyncIterator[str]:
+        """Yield response text deltas as the model generates them.
+
+        Groq and Anthropic stream natively; other providers yield the full
+        response as a single chunk.
+        """
+        model_type = model_type or self.model_type
+        provider = self.model_providers[model_type]
+
+        if provider not in (LLMProvider.GROQ, LLMProvider.ANTHROPIC):
+            yield await self.get_response(prompt, model_type, override_config, config_type)
+            return
+
+        model_config = self.model_configs[model_type]
+        config = model_config.get(config_type, model_config["default"]).copy()
+        if override_config:
+            config.update(override_config)
+        # Streaming is always on here; a configured "stream" would clash with stream=True
+        config.pop("stream", None)
+
+        try:
+            if provider == LLMProvider.GROQ:
+                client = AsyncGroq(api_key=self.groq_api_key)
+                stream = await client.chat.completions.create(
+                    model=model_type.value,
+                    messages=self._prepare_groq_messages(prompt),
+                    stream=True,
+                    **config
+                )
+                # Closes the HTTP response if the consumer stops early
+                async with stream:
+                    async for chunk in stream:
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                        if delta:
+                            yield delta
+            else:
+                if not self.anthropic_api_key:
+                    raise ValueError("Anthropic API key not found")
+                client = AsyncAnthropic(api_key=self.anthropic_api_key)
+                system_message, user_messages = self._split_claude_messages(
+                    self._prepare_claude_messages(prompt)
+                )
+                async with client.messages.stream(
+                    model=model_type.value,
+                    system=system_message,
+                    messages=user_messages,
+                    temperature=config.get('temperature', 0.7),
+                    max_tokens=config.get('max_tokens', 500)
+                ) as stream:
+                    async for text in stream.text_stream:
+                        yield text
+
+        except Exception as e:
+            logger.error(f"Error streaming LLM response: {str(e)}", exc_info=True)
+            logger.error(f"Provider: {provider}")
+            logger.error(f"Model: {model_type}")
+            yield "Sorry, I encountered an error processing your request."
+
     def _prepare_messages(self, prompt: str | list, provider: LLMProvider) -> list:
         """Prepare messages based on provider and input type"""
         if provider == LLMProvider.ANTHROPIC:
@@ -269,17 +333,7 @@ class LLMService:
             
             try:
                 # Extract system message
-                system_message = None
-                user_messages = []
-                
-                for msg in messages:
-                    if msg['role'] == 'system':
-                        system_message = msg['content']
-                    else:
-                        user_messages.append(msg)
-                
-                if not system_message:
-                    system_message = "You are Rin, a cute VTuber who streams about crypto."
+                system_message, user_messages = self._split_claude_messages(messages)
                 
                 print("\nFormatted for Claude API:")
                 print(f"System: {system_message}")
@@ -288,10 +342,7 @@ class LLMService:
                 message = await client.messages.create(
                     model=model_type.value,
                     system=system_message,  # Pass system message separately
-                    messages=[
-                        {'role': msg['role'], 'content': msg['content']}
-                        for msg in user_messages  # Only pass non-system messages
-                    ],
+                    messages=user_messages,  # Only pass non-system messages
                     temperature=config.get('temperature', 0.7),
                     max_tokens=config.get('max_tokens', 500)
                 )
@@ -316,6 +367,29 @@ class LLMService:
             print(f"\nError in Claude response generation: {str(e)}")
             raise
 
+    def _split_claude_messages(self, messages: list) -> tuple:
+        """Separate the system prompt from the conversation turns for the Claude API"""
+        system_message = None
+        user_messages = []
+
+        for msg in messages:
+            if msg['role'] == 'system':
+                system_message = msg['content']
+                # Mark static system prompts as cacheable prefix blocks
+                if msg.get('cache_control'):
+                    system_message = [{
+                        "type": "text",
+                        "text": msg['content'],
+                        "cache_control": msg['cache_control']
+                    }]
+            else:
+                user_messages.append({'role': msg['role'], 'content': msg['content']})
+
+        if not system_message:
+            system_message = "You are Rin, a cute VTuber who streams about crypto."
+
+        return system_message, user_messages
+
     async def _get_together_response(self, prompt: str | list, model_type: ModelType, config: Dict) -> str:
         messages = self._prepare_together_messages(prompt)
         validated_messages = self._validate_messages(messages)
@@ -546,6 +620,7 @@ class LLMService:
             for msg in messages:
                 if isinstance(msg, dict) and 'role' in msg and 'content' in msg:
                     if msg['role'] in ['system', 'user', 'assistant']:
-                        formatted_messages.append(msg)
+                        # Groq caches shared prefixes automatically; drop provider-specific keys
+                        formatted_messages.append({'role': msg['role'], 'content': msg['content']})
             return formatted_messages
         return messages
\ No newline at end of file
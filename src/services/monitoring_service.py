@@ -2,7 +2,6 @@ import asyncio
 import logging
 from datetime import datetime, UTC, timedelta
 import time
-from motor.motor_asyncio import AsyncIOMotorClient
 from bson.objectid import ObjectId
 from typing import Dict, List, Optional, Any
 
@@ -34,8 +33,8 @@ class LimitOrderMonitoringService:
     """Service for monitoring and executing limit orders when conditions are met"""
     
     def __init__(self, mongo_uri: str, schedule_manager: ScheduleManager = None):
-        self.mongo_client = AsyncIOMotorClient(mongo_uri)
-        self.db = RinDB(self.mongo_client)
+        self.db = RinDB.get(mongo_uri)
+        self.mongo_client = self.db.client
         self.tool_state_manager = ToolStateManager(db=self.db)
         self.schedule_manager = schedule_manager
         
@@ -49,6 +48,8 @@ class LimitOrderMonitoringService:
         self.running = False
         self._task = None
         self._check_interval = 30  # Default check interval in seconds
+        # Set when a limit order is activated so the loop checks it without waiting out the interval
+        self._wakeup = asyncio.Event()
 
     async def inject_dependencies(self, **services):
         """Inject required services"""
@@ -143,8 +144,12 @@ class LimitOrderMonitoringService:
                         except Exception as e:
                             logger.error(f"Error checking limit order {order.get('_id')}: {e}", exc_info=True)
                 
-                # Sleep before next check
-                await asyncio.sleep(self._check_interval)
+                # Sleep before next check, or until a newly activated order wakes us
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self._check_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
                 
             except Exception as e:
                 logger.error(f"Error in monitoring loop: {e}", exc_info=True)
@@ -399,6 +404,10 @@ class LimitOrderMonitoringService:
         except Exception as e:
             logger.error(f"Error marking limit order as expired: {e}", exc_info=True)
 
+    def notify_order_activated(self):
+        """Wake the monitoring loop so newly scheduled limit orders get their first check now"""
+        self._wakeup.set()
+
     async def register_limit_order(self, order_id: str, params: Dict):
         """Register a new limit order with the monitoring service"""
         try:
@@ -496,9 +505,11 @@ class LimitOrderMonitoringService:
 
     async def _check_price_with_coingecko(self, from_token: str, to_token: str) -> Optional[float]:
         try:
-            # Get prices for both tokens
-            from_price = await self.coingecko_client.get_token_price(from_token)
-            to_price = await self.coingecko_client.get_token_price(to_token)
+            # Get prices for both tokens; the lookups are independent, so overlap them
+            from_price, to_price = await asyncio.gather(
+                self.coingecko_client.get_token_price(from_token),
+                self.coingecko_client.get_token_price(to_token)
+            )
             
             if from_price and to_price:
                 # Calculate relative price
@@ -1,7 +1,6 @@
 import asyncio
 import logging
 from datetime import datetime, UTC
-from motor.motor_asyncio import AsyncIOMotorClient
 from src.clients.twitter_client import TwitterAgentClient
 from src.db.db_schema import ContentType, RinDB
 from src.db.enums import OperationStatus, ToolOperationState, ScheduleState
@@ -15,8 +14,8 @@ logger = logging.getLogger(__name__)
 
 class ScheduleService:
     def __init__(self, mongo_uri: str, orchestrator=None):
-        self.mongo_client = AsyncIOMotorClient(mongo_uri)
-        self.db = RinDB(self.mongo_client)
+        self.db = RinDB.get(mongo_uri)
+        self.mongo_client = self.db.client
         self.tool_state_manager = ToolStateManager(db=self.db)
         
         # Initialize Twitter client first
@@ -128,32 +127,45 @@ class ScheduleService:
                             
                             # Update item status based on execution result
                             if result and result.get('success'):
-                                await self.db.tool_items.update_one(
+                                executed_at = datetime.now(UTC)
+                                # Resolve the schedule filter before creating the item write, so an
+                                # invalid schedule_id can't leave that coroutine un-awaited
+                                schedule_filter = (
+                                    {"_id": ObjectId(item['schedule_id'])}
+                                    if item.get('schedule_id') else None
+                                )
+                                item_update = self.db.tool_items.update_one(
                                     {"_id": item['_id']},
                                     {"$set": {
                                         "status": OperationStatus.EXECUTED.value,
                                         "state": ToolOperationState.COMPLETED.value,
-                                        "executed_time": datetime.now(UTC),
+                                        "executed_time": executed_at,
                                         "api_response": result,
                                         "metadata.execution_result": result,
-                                        "metadata.executed_at": datetime.now(UTC).isoformat(),
+                                        "metadata.executed_at": executed_at.isoformat(),
                                         "metadata.schedule_state": ScheduleState.COMPLETED.value
                                     }}
                                 )
-                                logger.info(f"Successfully executed scheduled item {item['_id']}")
                                 
-                                # Update schedule execution status
-                                if item.get('schedule_id'):
-                                    await self.db.scheduled_operations.update_one(
-                                        {"_id": ObjectId(item.get('schedule_id'))},
-                                        {"$inc": {
-                                            "metadata.execution_status.pending": -1,
-                                            "metadata.execution_status.completed": 1
-                                        }}
+                                if schedule_filter:
+                                    # The item and schedule counters are separate documents, so write both at once
+                                    await asyncio.gather(
+                                        item_update,
+                                        self.db.scheduled_operations.update_one(
+                                            schedule_filter,
+                                            {"$inc": {
+                                                "metadata.execution_status.pending": -1,
+                                                "metadata.execution_status.completed": 1
+                                            }}
+                                        )
                                     )
+                                    logger.info(f"Successfully executed scheduled item {item['_id']}")
                                     
                                     # Check if schedule is complete
                                     await self._check_schedule_completion(item.get('schedule_id'))
+                                else:
+                                    await item_update
+                                    logger.info(f"Successfully executed scheduled item {item['_id']}")
                             else:
                                 error_msg = result.get('error') if result else str(execution_error)
                                 logger.error(f"Failed to execute scheduled item {item['_id']}: {error_msg}")
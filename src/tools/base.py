@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional, Literal
 import asyncio
 from datetime import datetime, timedelta
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from src.db.db_schema import ContentType, ToolType
 
 class ToolRegistry(BaseModel):
@@ -250,4 +250,26 @@ class LimitOrderToolParameters(BaseModel):
     destination_chain: Optional[str] = Field(
         default=None,
         description="Optional destination chain for withdrawal"
-    )
\ No newline at end of file
+    )
+
+class LimitOrderAnalysisParameters(BaseModel):
+    """Limit order parameters extracted by the intents command analyzer"""
+    # Optional fields (to_chain, slippage, destination_*) are kept as given
+    model_config = ConfigDict(extra="allow")
+
+    from_token: str
+    from_amount: float
+    to_token: str
+    target_price_usd: float
+
+class LimitOrderToolSpec(BaseModel):
+    """Single tool entry in the intents analyzer response"""
+    tool_name: str = "intents"
+    action: str = "limit_order"
+    parameters: LimitOrderAnalysisParameters
+    priority: int = 1
+
+class LimitOrderAnalysis(BaseModel):
+    """Model for the intents analyzer LLM response"""
+    tools_needed: List[LimitOrderToolSpec] = Field(min_length=1)
+    reasoning: str = ""
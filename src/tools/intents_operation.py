@@ -1,9 +1,14 @@
-from datetime import datetime, UTC, timedelta
+from datetime import datetime, UTC
 import logging
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, AsyncIterator
 import json
+import orjson
 from bson import ObjectId
+from pydantic import ValidationError
 import asyncio
+import time
+from types import MappingProxyType
+from collections import OrderedDict
 
 from src.tools.base import (
     BaseTool,
@@ -11,13 +16,15 @@ from src.tools.base import (
     AgentDependencies,
     CommandAnalysis,
     ToolOperation,
-    ToolRegistry
+    ToolRegistry,
+    LimitOrderAnalysis
 )
 from src.managers.tool_state_manager import ToolStateManager
 from src.services.llm_service import LLMService, ModelType
 from src.db.mongo_manager import MongoManager
 from src.db.enums import OperationStatus, ToolOperationState, ScheduleState, ContentType, ToolType
 from src.utils.json_parser import parse_strict_json
+from src.prompts.tool_prompts import ToolPrompts
 from src.managers.approval_manager import ApprovalManager, ApprovalAction, ApprovalState
 from src.managers.schedule_manager import ScheduleManager
 from src.clients.coingecko_client import CoinGeckoClient
@@ -40,6 +47,74 @@ from src.clients.near_intents_client.config import (
 )
 
 logger = logging.getLogger(__name__)
+# Prompt/response payload dumps; set this logger to WARNING to skip them entirely
+trace_logger = logging.getLogger(f"{__name__}.trace")
+
+# Display strings for a limit order, filled from the analyzer parameters
+_TOPIC_TMPL = "Limit order: {from_token} to {to_token} at ${target_price_usd}"
+_TITLE_TMPL = "Limit Order: {from_token} to {to_token} at ${target_price_usd}"
+
+# System messages for the analyzer and description prompts in ToolPrompts
+_ANALYZER_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a precise blockchain intents analyzer. Return ONLY valid JSON with no additional text."
+}
+
+_DESCRIPTION_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a cryptocurrency expert. Generate clear, detailed descriptions for limit orders. Return ONLY valid JSON with no markdown formatting or additional text."
+}
+
+# LLM call settings; the configs are read-only since LLMService only merges them
+_ANALYZER_LLM_KWARGS = {
+    "model_type": ModelType.GROQ_LLAMA_3_3_70B,
+    "override_config": MappingProxyType({
+        "temperature": 0.15,
+        "max_tokens": 500
+    })
+}
+
+_DESCRIPTION_LLM_KWARGS = {
+    "model_type": ModelType.GROQ_LLAMA_3_3_70B,
+    "override_config": MappingProxyType({
+        "temperature": 0.15,  # Lower temperature for more predictable output
+        "max_tokens": 800    # Upper bound only; generation stops when the JSON closes
+    })
+}
+
+def _description_key(params: Dict) -> bytes:
+    """Cache key for a limit order description: its parameters as sorted-key JSON"""
+    return orjson.dumps(params, option=orjson.OPT_SORT_KEYS)
+
+async def _read_json_object(chunks: AsyncIterator[str]) -> str:
+    """Collect streamed text until the first top-level JSON object closes"""
+    parts = []
+    depth = 0
+    in_string = False
+    escaped = False
+    try:
+        async for chunk in chunks:
+            parts.append(chunk)
+            for char in chunk:
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif char == '\\':
+                        escaped = True
+                    elif char == '"':
+                        in_string = False
+                elif char == '"':
+                    in_string = True
+                elif char == '{':
+                    depth += 1
+                elif char == '}' and depth:
+                    depth -= 1
+                    if depth == 0:
+                        # Anything the model writes after the object is discarded anyway
+                        return ''.join(parts)
+        return ''.join(parts)
+    finally:
+        await chunks.aclose()
 
 class IntentsTool(BaseTool):
     """Limit order tool for NEAR protocol intents operations (deposit, swap, withdraw)"""
@@ -49,6 +124,15 @@ class IntentsTool(BaseTool):
     description = "Perform limit order operations via NEAR intents (includes deposit, swap, withdraw)"
     version = "1.0"
     
+    # Seconds a cached operation read stays valid within one request
+    OPERATION_CACHE_TTL = 1.0
+    
+    # run() and _analyze_command only need the operation's state and _id
+    OPERATION_STATE_FIELDS = ("state",)
+    
+    # Parsed LLM descriptions kept for repeated orders with identical parameters
+    DESCRIPTION_CACHE_SIZE = 128
+    
     # Tool registry configuration - we'll need to add these enum values
     registry = ToolRegistry(
         content_type=ContentType.LIMIT_ORDER,
@@ -77,6 +161,14 @@ class IntentsTool(BaseTool):
         # Add these lines for intent tracking
         self.intent_statuses = {}
         self.active_intents = {}
+        
+        # (session_id, fields) -> (read time, operation); lets one request reuse a single read
+        self._operation_cache: Dict[tuple, tuple] = {}
+        
+        # Sorted-params JSON -> parsed description, LRU-bounded by DESCRIPTION_CACHE_SIZE
+        self._description_cache: OrderedDict = OrderedDict()
+        # Descriptions started during command analysis, keyed like _description_cache
+        self._description_tasks: Dict[bytes, asyncio.Task] = {}
 
     def inject_dependencies(self, **services):
         """Inject required services - called by orchestrator during registration"""
@@ -89,10 +181,35 @@ class IntentsTool(BaseTool):
         self.solver_bus_client = services.get("solver_bus_client")
         self.db = self.tool_state_manager.db if self.tool_state_manager else None
 
+    async def _get_operation_cached(self, fields: Optional[tuple] = None) -> Optional[Dict]:
+        """Get the session's operation, reusing a read made within the last OPERATION_CACHE_TTL seconds"""
+        now = time.monotonic()
+        # Drop expired reads so sessions that never come back don't accumulate
+        for stale in [k for k, (read_at, _) in self._operation_cache.items()
+                      if now - read_at >= self.OPERATION_CACHE_TTL]:
+            del self._operation_cache[stale]
+
+        key = (self.deps.session_id, fields)
+        _, operation = self._operation_cache.get(key, (0.0, None))
+        if operation:
+            return operation
+        operation = await self.tool_state_manager.get_operation(
+            self.deps.session_id,
+            fields=list(fields) if fields else None
+        )
+        self._operation_cache[key] = (time.monotonic(), operation)
+        return operation
+
+    def _invalidate_operation_cache(self) -> None:
+        """Forget the session's cached operation reads after writing to it"""
+        session_id = self.deps.session_id
+        for key in [key for key in self._operation_cache if key[0] == session_id]:
+            del self._operation_cache[key]
+
     async def run(self, input_data: str) -> Dict:
         """Run the intents tool - handles limit order flow"""
         try:
-            operation = await self.tool_state_manager.get_operation(self.deps.session_id)
+            operation = await self._get_operation_cached(self.OPERATION_STATE_FIELDS)
             
             if not operation or operation.get('state') == ToolOperationState.COMPLETED.value:
                 # Initial analysis and command flow for limit order
@@ -127,62 +244,17 @@ class IntentsTool(BaseTool):
             logger.info(f"Starting command analysis for: {command}")
             
             # Get the existing operation that was created by orchestrator
-            operation = await self.tool_state_manager.get_operation(self.deps.session_id)
+            operation = await self._get_operation_cached(self.OPERATION_STATE_FIELDS)
             if not operation:
                 raise ValueError("No active operation found")
                 
             tool_operation_id = str(operation['_id'])
             
             # Get LLM analysis
-            prompt = f"""You are a blockchain intents analyzer. Determine the limit order parameters for buying or selling a token based on the user's command.
-
-Command: "{command}"
-
-Required parameters for limit order:
-   - topic: what to swap (e.g., NEAR to USDC, USDC to NEAR)
-   - from_token: token to swap from (e.g., NEAR, USDC)
-   - from_amount: amount to swap
-   - to_token: token to swap to (e.g., NEAR, USDC)
-   - target_price_usd: target price in USD per from_token
-   - to_chain: chain for the output token (optional, defaults to "ethereum")
-   - expiration_hours: hours until order expires (optional, defaults to 24)
-   - slippage: slippage tolerance percentage (optional, defaults to 0.5)
-
-Instructions:
-- Return ONLY valid JSON matching the example format
-- Extract all token symbols, amounts, addresses, and chains if specified
-- For limit_order, min_price should be the minimum amount of to_token per from_token
-- If the user specifies a price like "$3.00 / NEAR", set min_price to 3.0
-- Follow the exact schema provided
-- Include NO additional text or markdown
-
-Example response format:
-{{
-    "tools_needed": [{{
-        "tool_name": "intents",
-        "action": "limit_order",
-        "parameters": {{
-            "topic": "NEAR to USDC",
-            "from_token": "NEAR",
-            "from_amount": 5.0,
-            "to_token": "USDC",
-            "target_price_usd": 3.0,
-            "to_chain": "ethereum",
-            "expiration_hours": 24,
-            "slippage": 0.5,
-            "destination_address": "0x7fe4A51B1e610dcf87f2669B03Ef9d4b66b85ca8", # optional
-            "destination_chain": "ethereum" # optional
-        }},
-        "priority": 1
-    }}],
-    "reasoning": "User requested a limit order to swap 5 NEAR to USDC when the price reaches $3.00 per NEAR"
-}}"""
+            prompt = ToolPrompts.INTENTS_LIMIT_ORDER.format(command=command)
 
             messages = [
-                {
-                    "role": "system",
-                    "content": "You are a precise blockchain intents analyzer. Return ONLY valid JSON with no additional text."
-                },
+                _ANALYZER_SYSTEM_MESSAGE,
                 {
                     "role": "user",
                     "content": prompt
@@ -190,52 +262,47 @@ Example response format:
             ]
 
             # Log the prompt being sent
-            logger.info(f"Sending prompt to LLM: {messages}")
+            if trace_logger.isEnabledFor(logging.DEBUG):
+                trace_logger.debug("Sending prompt to LLM: %s", messages)
 
             # Get LLM response
-            response = await self.llm_service.get_response(
-                prompt=messages,
-                model_type=ModelType.GROQ_LLAMA_3_3_70B,
-                override_config={
-                    "temperature": 0.15,
-                    "max_tokens": 500
-                }
-            )
+            response = await self.llm_service.get_response(prompt=messages, **_ANALYZER_LLM_KWARGS)
             
-            logger.info(f"Raw LLM response: {response}")
+            if trace_logger.isEnabledFor(logging.DEBUG):
+                trace_logger.debug("Raw LLM response: %s", response)
             
             try:
-                # Parse response and extract key parameters
-                parsed_data = json.loads(response)
-                logger.info(f"Parsed JSON data: {parsed_data}")
-                
-                tools_data = parsed_data.get("tools_needed", [{}])[0]
-                logger.info(f"Extracted tools_data: {tools_data}")
-                
-                params = tools_data.get("parameters", {})
-                logger.info(f"Extracted parameters: {params}")
+                # Validate the response shape once; missing or non-numeric order fields fail here
+                analysis = LimitOrderAnalysis.model_validate_json(response)
+                params = analysis.tools_needed[0].parameters.model_dump(exclude_unset=True)
+                if trace_logger.isEnabledFor(logging.DEBUG):
+                    trace_logger.debug("Parsed analyzer response: %s", analysis)
+                    trace_logger.debug("Extracted parameters: %s", params)
                 
-                content_type = tools_data.get("content_type", "unknown")
-                
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse LLM response as JSON: {e}")
-                logger.error(f"Raw response that failed parsing: {response}")
+            except ValidationError as e:
+                logger.error(f"Invalid limit order analysis from LLM: {e}")
+                logger.error(f"Raw response that failed validation: {response}")
                 raise
             except Exception as e:
                 logger.error(f"Error processing LLM response: {e}")
                 raise
             
+            # Only the parameters feed the description, so generate it while the writes below run
+            self._prefetch_description(params)
+            
             # Set up monitoring parameters
+            now_s = time.time()
             monitoring_params = {
                 "check_interval_seconds": 60,
-                "last_checked_timestamp": int(datetime.now(UTC).timestamp()),
+                "last_checked_timestamp": int(now_s),
                 "best_price_seen": 0,
-                "expiration_timestamp": int((datetime.now(UTC) + timedelta(hours=params.get("expiration_hours", 24))).timestamp()),
+                "expiration_timestamp": int(now_s + params.get("expiration_hours", 24) * 3600),
                 "max_checks": 1000
             }
             
-            # Create schedule for monitoring service
-            schedule_id = await self.schedule_manager.initialize_schedule(
+            # Create schedule for monitoring service; its _id is assigned up front, so the
+            # operation update below can record the reference while the insert is in flight
+            schedule_doc = self.schedule_manager.build_schedule_doc(
                 tool_operation_id=tool_operation_id,
                 schedule_info={
                     "schedule_type": "monitoring",
@@ -243,31 +310,34 @@ Example response format:
                     "total_items": 1,
                     "monitoring_params": monitoring_params
                 },
-                content_type=self.registry.content_type.value,
-                session_id=self.deps.session_id
+                content_type=self.registry.content_type.value
             )
+            schedule_id = str(schedule_doc["_id"])
             
             # Create topic string for display and tracking
-            topic = f"Limit order: {params['from_token']} to {params['to_token']} at ${params['target_price_usd']}"
+            topic = _TOPIC_TMPL.format_map(params)
             
-            # Update operation with all necessary info
-            await self.tool_state_manager.update_operation(
-                session_id=self.deps.session_id,
-                tool_operation_id=tool_operation_id,
-                input_data={
-                    "command_info": {
-                        "operation_type": "limit_order",
-                        "parameters": params,
-                        "monitoring_params": monitoring_params,
-                        "topic": topic
+            # Insert the schedule and update operation with all necessary info concurrently
+            await asyncio.gather(
+                self.db.scheduled_operations.insert_one(schedule_doc),
+                self.tool_state_manager.update_operation(
+                    session_id=self.deps.session_id,
+                    tool_operation_id=tool_operation_id,
+                    input_data={
+                        "command_info": {
+                            "operation_type": "limit_order",
+                            "parameters": params,
+                            "monitoring_params": monitoring_params,
+                            "topic": topic
+                        },
+                        "schedule_id": schedule_id
                     },
-                    "schedule_id": schedule_id
-                },
-                metadata={
-                    "schedule_state": ScheduleState.PENDING.value,
-                    "schedule_id": schedule_id,
-                    "operation_type": "limit_order"
-                }
+                    metadata={
+                        "schedule_state": ScheduleState.PENDING.value,
+                        "schedule_id": schedule_id,
+                        "operation_type": "limit_order"
+                    }
+                )
             )
             
             # Return all required information for orchestrator and managers
@@ -317,6 +387,121 @@ Example response format:
         except Exception as e:
             logger.error(f"Error in limit order analysis: {e}", exc_info=True)
             raise
+        finally:
+            # The operation was (possibly partly) written above
+            self._invalidate_operation_cache()
+
+    def _cache_description(self, params: Dict, content: Dict) -> None:
+        """Remember a parsed LLM description for orders with these parameters"""
+        self._description_cache[_description_key(params)] = content
+        if len(self._description_cache) > self.DESCRIPTION_CACHE_SIZE:
+            self._description_cache.popitem(last=False)
+
+    def _prefetch_description(self, params: Dict) -> None:
+        """Start the description LLM call now so it overlaps the remaining analysis writes"""
+        key = _description_key(params)
+        if key in self._description_cache or key in self._description_tasks:
+            return
+        task = asyncio.create_task(self._generate_llm_description(params))
+        self._description_tasks[key] = task
+        
+        def _forget(done: asyncio.Task) -> None:
+            self._description_tasks.pop(key, None)
+            if not done.cancelled() and done.exception():
+                logger.error(f"Prefetched limit order description failed: {done.exception()}")
+        
+        task.add_done_callback(_forget)
+
+    async def _describe_order(self, params: Dict) -> Dict:
+        """Get the order description from the cache, a prefetch in flight, or a new LLM call"""
+        key = _description_key(params)
+        generated_content = self._description_cache.get(key)
+        if generated_content is not None:
+            self._description_cache.move_to_end(key)
+            logger.info("Reusing cached limit order description")
+            return generated_content
+        
+        task = self._description_tasks.get(key)
+        if task:
+            return await task
+        return await self._generate_llm_description(params)
+
+    async def _generate_llm_description(self, params: Dict) -> Dict:
+        """Generate the approval title/description/warnings for one limit order"""
+        # Generate description using LLM with improved prompt
+        prompt = ToolPrompts.LIMIT_ORDER_DESCRIPTION.format(
+            from_amount=params['from_amount'],
+            from_token=params['from_token'],
+            to_token=params['to_token'],
+            target_price_usd=params['target_price_usd'],
+            to_chain=params.get('to_chain', 'ethereum'),
+            destination_address=params.get('destination_address', 'default wallet'),
+            destination_chain=params.get('destination_chain', 'ethereum'),
+            expiration_hours=params.get('expiration_hours', 24)
+        )
+
+        messages = [
+            _DESCRIPTION_SYSTEM_MESSAGE,
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+
+        # Log the prompt being sent
+        logger.info(f"Sending content generation prompt to LLM")
+
+        # Stream the LLM response, stopping once the JSON object is complete
+        response = await _read_json_object(
+            self.llm_service.stream_response(prompt=messages, **_DESCRIPTION_LLM_KWARGS)
+        )
+        
+        # Log the raw response for debugging
+        if trace_logger.isEnabledFor(logging.DEBUG):
+            trace_logger.debug("Raw LLM response for content generation: %s", response)
+        
+        # Clean up response - remove any markdown formatting
+        cleaned_response = response.strip()
+        if cleaned_response.startswith('```') and cleaned_response.endswith('```'):
+            # Remove markdown code blocks
+            cleaned_response = '\n'.join(cleaned_response.split('\n')[1:-1])
+        
+        # Remove any non-JSON text before or after the JSON structure
+        if '{' in cleaned_response and '}' in cleaned_response:
+            start_idx = cleaned_response.find('{')
+            end_idx = cleaned_response.rfind('}') + 1
+            cleaned_response = cleaned_response[start_idx:end_idx]
+        
+        if trace_logger.isEnabledFor(logging.DEBUG):
+            trace_logger.debug("Cleaned response: %s", cleaned_response)
+        
+        # Try to parse the response as JSON with robust error handling
+        try:
+            generated_content = orjson.loads(cleaned_response)
+            if trace_logger.isEnabledFor(logging.DEBUG):
+                trace_logger.debug("Successfully parsed JSON content: %s", generated_content)
+            self._cache_description(params, generated_content)
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse LLM response as JSON: {e}")
+            
+            # Try to use the parse_strict_json utility if available
+            try:
+                generated_content = parse_strict_json(cleaned_response)
+                logger.info(f"Successfully parsed with parse_strict_json: {generated_content}")
+                self._cache_description(params, generated_content)
+            except Exception as parse_error:
+                logger.error(f"Failed to parse with parse_strict_json: {parse_error}")
+                
+                # Last resort: create minimal content structure
+                logger.warning("Using minimal content structure as last resort")
+                generated_content = {
+                    "title": _TITLE_TMPL.format_map(params),
+                    "description": f"This limit order will execute when {params['from_token']} reaches ${params['target_price_usd']}.",
+                    "warnings": ["Cryptocurrency prices are volatile", "No guarantee target price will be reached"],
+                    "expected_outcome": f"Exchange {params['from_amount']} {params['from_token']} for {params['to_token']}."
+                }
+        
+        return generated_content
 
     async def _generate_content(self, topic: str, count: int, schedule_id: str = None, tool_operation_id: str = None) -> Dict:
         """Generate human-readable content for limit order approval"""
@@ -324,105 +509,20 @@ Example response format:
             logger.info(f"Generating limit order content for approval: {topic}")
             
             # Get parent operation to access stored parameters
-            operation = await self.tool_state_manager.get_operation(self.deps.session_id)
+            operation = await self._get_operation_cached()
             if not operation:
                 raise ValueError("No active operation found")
             
             # Get the parameters from _analyze_command
             params = operation.get("input_data", {}).get("command_info", {}).get("parameters", {})
-            logger.info(f"Using parameters for content generation: {params}")
+            if trace_logger.isEnabledFor(logging.DEBUG):
+                trace_logger.debug("Using parameters for content generation: %s", params)
             
-            # Generate description using LLM with improved prompt
-            prompt = f"""You are a cryptocurrency expert. Generate a detailed description for a limit order with the following parameters:
-
-Operation Details:
-- Swap {params['from_amount']} {params['from_token']} for {params['to_token']}
-- Target Price: ${params['target_price_usd']} per {params['from_token']}
-- Output Chain: {params.get('to_chain', 'ethereum')}
-- Destination: {params.get('destination_address', 'default wallet')} on {params.get('destination_chain', 'ethereum')}
-- Expires in: {params.get('expiration_hours', 24)} hours
-
-Include:
-1. A clear title summarizing the limit order
-2. A detailed description of what will happen when executed
-3. Important warnings about market volatility and risks
-4. Expected outcome when price target is met
-
-IMPORTANT: Your response MUST be valid JSON in the following format:
-{{
-    "title": "Limit Order Summary",
-    "description": "Detailed description here...",
-    "warnings": ["Warning 1", "Warning 2"],
-    "expected_outcome": "Expected outcome description"
-}}
-
-Do not include any text outside of this JSON structure."""
-
-            messages = [
-                {
-                    "role": "system",
-                    "content": "You are a cryptocurrency expert. Generate clear, detailed descriptions for limit orders. Return ONLY valid JSON with no markdown formatting or additional text."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-
-            # Log the prompt being sent
-            logger.info(f"Sending content generation prompt to LLM")
-
-            # Get LLM response with increased max_tokens and lower temperature
-            response = await self.llm_service.get_response(
-                prompt=messages,
-                model_type=ModelType.GROQ_LLAMA_3_3_70B,
-                override_config={
-                    "temperature": 0.15,  # Lower temperature for more predictable output
-                    "max_tokens": 800    # Increased token limit
-                }
-            )
-            
-            # Log the raw response for debugging
-            logger.info(f"Raw LLM response for content generation: {response}")
-            
-            # Clean up response - remove any markdown formatting
-            cleaned_response = response.strip()
-            if cleaned_response.startswith('```') and cleaned_response.endswith('```'):
-                # Remove markdown code blocks
-                cleaned_response = '\n'.join(cleaned_response.split('\n')[1:-1])
-            
-            # Remove any non-JSON text before or after the JSON structure
-            if '{' in cleaned_response and '}' in cleaned_response:
-                start_idx = cleaned_response.find('{')
-                end_idx = cleaned_response.rfind('}') + 1
-                cleaned_response = cleaned_response[start_idx:end_idx]
-            
-            logger.info(f"Cleaned response: {cleaned_response}")
-            
-            # Try to parse the response as JSON with robust error handling
-            try:
-                generated_content = json.loads(cleaned_response)
-                logger.info(f"Successfully parsed JSON content: {generated_content}")
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse LLM response as JSON: {e}")
-                
-                # Try to use the parse_strict_json utility if available
-                try:
-                    generated_content = parse_strict_json(cleaned_response)
-                    logger.info(f"Successfully parsed with parse_strict_json: {generated_content}")
-                except Exception as parse_error:
-                    logger.error(f"Failed to parse with parse_strict_json: {parse_error}")
-                    
-                    # Last resort: create minimal content structure
-                    logger.warning("Using minimal content structure as last resort")
-                    generated_content = {
-                        "title": f"Limit Order: {params['from_token']} to {params['to_token']} at ${params['target_price_usd']}",
-                        "description": f"This limit order will execute when {params['from_token']} reaches ${params['target_price_usd']}.",
-                        "warnings": ["Cryptocurrency prices are volatile", "No guarantee target price will be reached"],
-                        "expected_outcome": f"Exchange {params['from_amount']} {params['from_token']} for {params['to_token']}."
-                    }
+            # Identical orders reuse an earlier description; new ones were usually started in _analyze_command
+            generated_content = await self._describe_order(params)
             
             # Create tool item for approval
+            now_iso = datetime.now(UTC).isoformat()
             tool_item = {
                 "session_id": self.deps.session_id,
                 "tool_operation_id": tool_operation_id,
@@ -447,12 +547,12 @@ Do not include any text outside of this JSON structure."""
                     }
                 },
                 "metadata": {
-                    "generated_at": datetime.now(UTC).isoformat(),
+                    "generated_at": now_iso,
                     "scheduling_type": "monitored",
                     "state_history": [{
                         "state": operation["state"],
                         "status": OperationStatus.PENDING.value,
-                        "timestamp": datetime.now(UTC).isoformat()
+                        "timestamp": now_iso
                     }]
                 }
             }
@@ -489,9 +589,14 @@ Do not include any text outside of this JSON structure."""
         except Exception as e:
             logger.error(f"Error generating limit order content: {e}", exc_info=True)
             raise
+        finally:
+            # The operation was (possibly partly) written above
+            self._invalidate_operation_cache()
 
     async def execute_scheduled_operation(self, operation: Dict) -> Dict:
         """Execute a scheduled limit order operation following the intents lifecycle"""
+        # Steps completed so far are reported back if any later step fails
+        execution_steps = []
         try:
             logger.info(f"Executing limit order operation: {operation.get('_id')}")
             
@@ -512,136 +617,154 @@ Do not include any text outside of this JSON structure."""
             if not from_token or from_amount <= 0 or not to_token:
                 raise ValueError(f"Missing or invalid parameters: from_token={from_token}, from_amount={from_amount}, to_token={to_token}")
 
-            execution_steps = []
-            try:
-                # IMPORTANT: Remove 'await' - this is not an async function
-                logger.info(f"Checking balance for token: '{from_token}'")
-                initial_balance = get_intent_balance(self.near_account, from_token)
-                initial_balance_float = float(initial_balance) if initial_balance is not None else 0
+            # The NEAR intents client is synchronous; its RPC calls run in worker
+            # threads so other sessions keep being served while they are in flight
+            logger.info(f"Checking balance for token: '{from_token}'")
+            initial_balance = await asyncio.to_thread(get_intent_balance, self.near_account, from_token)
+            initial_balance_float = float(initial_balance) if initial_balance is not None else 0
+            
+            logger.info(f"Initial {from_token} balance in intents: {initial_balance_float}")
+            execution_steps.append({
+                "step": "check_balance",
+                "result": {"initial_balance": initial_balance_float}
+            })
+
+            # Handle deposit if needed
+            if initial_balance_float < from_amount:
+                needed_amount = from_amount - initial_balance_float
+                logger.info(f"Depositing {needed_amount} {from_token}")
                 
-                logger.info(f"Initial {from_token} balance in intents: {initial_balance_float}")
+                if from_token == "NEAR":
+                    wrap_result = await asyncio.to_thread(wrap_near, self.near_account, needed_amount)
+                    logger.info(f"Wrapped NEAR result: {wrap_result}")
+                    execution_steps.append({
+                        "step": "wrap_near",
+                        "result": wrap_result
+                    })
+                    await self._wait_for_tx(wrap_result)
+                
+                deposit_result = await asyncio.to_thread(intent_deposit, self.near_account, from_token, needed_amount)
+                logger.info(f"Deposit result: {deposit_result}")
                 execution_steps.append({
-                    "step": "check_balance",
-                    "result": {"initial_balance": initial_balance_float}
+                    "step": "deposit",
+                    "result": deposit_result
                 })
+                await self._wait_for_tx(deposit_result)
+                
+                new_balance = await asyncio.to_thread(get_intent_balance, self.near_account, from_token)
+                new_balance_float = float(new_balance) if new_balance is not None else 0
+                if new_balance_float < from_amount:
+                    raise ValueError(f"Deposit verification failed. Balance: {new_balance_float} {from_token}")
+
+            # Execute swap
+            logger.info(f"Executing swap: {from_amount} {from_token} -> {to_token}")
+            swap_result = await asyncio.to_thread(
+                intent_swap,
+                self.near_account,
+                from_token,
+                from_amount,
+                to_token,
+                chain_out=chain_out
+            )
+            
+            if not swap_result or 'error' in swap_result:
+                raise Exception(f"Swap failed: {swap_result.get('error', 'Unknown error')}")
+            
+            execution_steps.append({
+                "step": "swap",
+                "result": swap_result
+            })
+            
+            # Wait for swap to complete
+            await asyncio.sleep(3)
+            
+            # Calculate received amount using from_decimals
+            received_amount = from_decimals(swap_result.get('amount_out', 0), to_token)
+            logger.info(f"Swap successful. Received {received_amount} {to_token}")
 
-                # Handle deposit if needed
-                if initial_balance_float < from_amount:
-                    needed_amount = from_amount - initial_balance_float
-                    logger.info(f"Depositing {needed_amount} {from_token}")
-                    
-                    if from_token == "NEAR":
-                        # IMPORTANT: Remove 'await' here too
-                        wrap_result = wrap_near(self.near_account, needed_amount)
-                        logger.info(f"Wrapped NEAR result: {wrap_result}")
-                        execution_steps.append({
-                            "step": "wrap_near",
-                            "result": wrap_result
-                        })
-                        await asyncio.sleep(3)  # Keep this await - asyncio.sleep is async
-                    
-                    # IMPORTANT: Remove 'await' here too
-                    deposit_result = intent_deposit(self.near_account, from_token, needed_amount)
-                    logger.info(f"Deposit result: {deposit_result}")
-                    execution_steps.append({
-                        "step": "deposit",
-                        "result": deposit_result
-                    })
-                    await asyncio.sleep(3)  # Keep this await
-                    
-                    # IMPORTANT: Remove 'await' here too
-                    new_balance = get_intent_balance(self.near_account, from_token)
-                    new_balance_float = float(new_balance) if new_balance is not None else 0
-                    if new_balance_float < from_amount:
-                        raise ValueError(f"Deposit verification failed. Balance: {new_balance_float} {from_token}")
-
-                # Execute swap - remove 'await' here too
-                logger.info(f"Executing swap: {from_amount} {from_token} -> {to_token}")
-                swap_result = intent_swap(
-                    self.near_account,
-                    from_token,
-                    from_amount,
-                    to_token,
-                    chain_out=chain_out
+            # 4. Handle withdrawal if enabled
+            if operation_details.get("destination_address"):
+                logger.info(f"Withdrawing {received_amount} {to_token} to {operation_details['destination_address']} on {operation_details['destination_chain']}")
+                
+                withdrawal_result = await asyncio.to_thread(
+                    smart_withdraw,
+                    account=self.near_account,
+                    token=to_token,
+                    amount=received_amount,
+                    destination_address=operation_details['destination_address'],
+                    destination_chain=operation_details['destination_chain']
                 )
                 
-                if not swap_result or 'error' in swap_result:
-                    raise Exception(f"Swap failed: {swap_result.get('error', 'Unknown error')}")
+                if not withdrawal_result or 'error' in withdrawal_result:
+                    raise Exception(f"Withdrawal failed: {withdrawal_result.get('error', 'Unknown error')}")
                 
                 execution_steps.append({
-                    "step": "swap",
-                    "result": swap_result
+                    "step": "withdraw",
+                    "result": withdrawal_result
                 })
                 
-                # Wait for swap to complete
-                await asyncio.sleep(3)
+                logger.info(f"Withdrawal successful: {withdrawal_result}")
                 
-                # Calculate received amount using from_decimals
-                received_amount = from_decimals(swap_result.get('amount_out', 0), to_token)
-                logger.info(f"Swap successful. Received {received_amount} {to_token}")
-
-                # 4. Handle withdrawal if enabled
-                if operation_details.get("destination_address"):
-                    logger.info(f"Withdrawing {received_amount} {to_token} to {operation_details['destination_address']} on {operation_details['destination_chain']}")
-                    
-                    withdrawal_result = smart_withdraw(
-                        account=self.near_account,
-                        token=to_token,
-                        amount=received_amount,
-                        destination_address=operation_details['destination_address'],
-                        destination_chain=operation_details['destination_chain']
-                    )
-                    
-                    if not withdrawal_result or 'error' in withdrawal_result:
-                        raise Exception(f"Withdrawal failed: {withdrawal_result.get('error', 'Unknown error')}")
-                    
-                    execution_steps.append({
-                        "step": "withdraw",
-                        "result": withdrawal_result
-                    })
-                    
-                    logger.info(f"Withdrawal successful: {withdrawal_result}")
-                    
-                    # Wait for withdrawal to complete
-                    await asyncio.sleep(3)
-
-                # 5. Final balance check
-                final_balance = get_intent_balance(self.near_account, to_token)
-                execution_steps.append({
-                    "step": "final_balance",
-                    "result": {"final_balance": final_balance}
-                })
+                # Wait for withdrawal to complete
+                await asyncio.sleep(3)
 
-                return {
-                    'success': True,
-                    'execution_steps': execution_steps,
-                    'final_result': {
-                        'from_token': from_token,
-                        'from_amount': from_amount,
-                        'to_token': to_token,
-                        'received_amount': received_amount,
-                        'destination_chain': operation_details.get('destination_chain', chain_out),
-                        'withdrawal_executed': bool(operation_details.get('destination_address'))
-                    },
-                    'execution_time': datetime.now(UTC).isoformat()
-                }
+            # 5. Final balance check
+            final_balance = await asyncio.to_thread(get_intent_balance, self.near_account, to_token)
+            execution_steps.append({
+                "step": "final_balance",
+                "result": {"final_balance": final_balance}
+            })
 
-            except Exception as e:
-                logger.error(f"Error in execution steps: {e}", exc_info=True)
-                return {
-                    'success': False,
-                    'error': str(e),
-                    'execution_steps': execution_steps,  # Include steps completed before error
-                    'execution_time': datetime.now(UTC).isoformat()
-                }
+            return {
+                'success': True,
+                'execution_steps': execution_steps,
+                'final_result': {
+                    'from_token': from_token,
+                    'from_amount': from_amount,
+                    'to_token': to_token,
+                    'received_amount': received_amount,
+                    'destination_chain': operation_details.get('destination_chain', chain_out),
+                    'withdrawal_executed': bool(operation_details.get('destination_address'))
+                },
+                'execution_time': datetime.now(UTC).isoformat()
+            }
 
         except Exception as e:
             logger.error(f"Error in execute_scheduled_operation: {e}", exc_info=True)
             return {
                 'success': False,
-                'error': str(e)
+                'error': str(e),
+                'execution_steps': execution_steps,  # Include steps completed before error
+                'execution_time': datetime.now(UTC).isoformat()
             }
 
+    async def _wait_for_tx(self, tx_result: Any, poll: float = 0.1, timeout: float = 5.0) -> None:
+        """Wait until a NEAR transaction outcome is final, polling its status if needed"""
+        if not isinstance(tx_result, dict):
+            # No outcome to inspect; fall back to the fixed settle time
+            await asyncio.sleep(3)
+            return
+
+        status = tx_result.get("status", {})
+        tx_hash = tx_result.get("transaction", {}).get("hash")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while isinstance(status, dict) and "SuccessValue" not in status and "Failure" not in status:
+            if not tx_hash or loop.time() >= deadline:
+                logger.warning(f"Transaction {tx_hash} not final after {timeout}s, continuing")
+                return
+            await asyncio.sleep(poll)
+            poll = min(poll * 1.5, 1.0)  # Back off; most transactions are final within the first few polls
+            outcome = await asyncio.to_thread(
+                self.near_account.provider.get_tx,
+                tx_hash,
+                self.near_account.account_id
+            )
+            status = outcome.get("status", {})
+
+        if isinstance(status, dict) and "Failure" in status:
+            raise Exception(f"Transaction {tx_hash} failed: {status['Failure']}")
+
     def can_handle(self, command_text: str, tool_type: Optional[str] = None) -> bool:
         """Check if this tool can handle the given command
         
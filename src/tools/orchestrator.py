@@ -27,6 +27,7 @@ from src.tools.post_tweets import TwitterTool
 
 # Client imports
 from src.clients.coingecko_client import CoinGeckoClient
+from src.clients.http_session import close_shared_session
 from src.clients.perplexity_client import PerplexityClient
 from src.clients.google_calendar_client import GoogleCalendarClient
 from src.clients.near_account_helper import get_near_account
@@ -199,6 +200,9 @@ class Orchestrator:
         for tool in self.tools.values():
             if hasattr(tool, 'cleanup'):
                 await tool.cleanup()
+        
+        # Close the HTTP connection pool shared by the API clients
+        await close_shared_session()
 
     async def process_command(self, command: str, deps: AgentDependencies) -> AgentResult:
         try:
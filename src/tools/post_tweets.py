@@ -351,6 +351,8 @@ Format the response as JSON:
             saved_items = []
             current_pending_items = operation.get("output_data", {}).get("pending_items", [])
             
+            tool_items = []
+            now_iso = datetime.now(UTC).isoformat()  # One generation pass shares one timestamp
             for item in generated_items.get('items', []):
                 tool_item = {
                     "session_id": self.deps.session_id,
@@ -366,24 +368,31 @@ Format the response as JSON:
                     },
                     "metadata": {
                         **item.get("metadata", {}),
-                        "generated_at": datetime.now(UTC).isoformat(),
+                        "generated_at": now_iso,
                         "parent_operation_state": operation["state"],
                         "state_history": [{
                             "state": operation["state"],
                             "status": OperationStatus.PENDING.value,
-                            "timestamp": datetime.now(UTC).isoformat()
+                            "timestamp": now_iso
                         }]
                     }
                 }
+                tool_items.append(tool_item)
+
+            # Save all items in one round-trip, then record them on the parent operation
+            if tool_items:
+                result = await self.db.tool_items.insert_many(tool_items, ordered=False)
+                item_states = {}
+                for tool_item, inserted_id in zip(tool_items, result.inserted_ids):
+                    item_id = str(inserted_id)
+                    current_pending_items.append(item_id)
+                    item_states[item_id] = {
+                        "state": operation["state"],
+                        "status": OperationStatus.PENDING.value
+                    }
+                    saved_items.append({**tool_item, "_id": item_id})
+                    logger.info(f"Saved tool item {item_id} with state {operation['state']}")
                 
-                # Save item
-                result = await self.db.tool_items.insert_one(tool_item)
-                item_id = str(result.inserted_id)
-                
-                # Add to pending items list
-                current_pending_items.append(item_id)
-                
-                # Update parent operation with new pending item
                 await self.tool_state_manager.update_operation(
                     session_id=self.deps.session_id,
                     tool_operation_id=tool_operation_id,
@@ -391,18 +400,9 @@ Format the response as JSON:
                         "pending_items": current_pending_items
                     },
                     metadata={
-                        "item_states": {
-                            item_id: {
-                                "state": operation["state"],
-                                "status": OperationStatus.PENDING.value
-                            }
-                        }
+                        "item_states": item_states
                     }
                 )
-                
-                saved_item = {**tool_item, "_id": item_id}
-                saved_items.append(saved_item)
-                logger.info(f"Saved tool item {item_id} with state {operation['state']}")
 
             logger.info(f"Generated and saved {len(saved_items)} tweet items")
             
@@ -1,12 +1,19 @@
 import re
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
 from src.db.enums import ToolType  # Add this import
 
 class TriggerDetector:
+    # Number of recent analyze() results kept; chat traffic repeats short messages often
+    ANALYSIS_CACHE_SIZE = 2048
+
     def __init__(self):
         # Initialize the tool_triggers dictionary first
         self.tool_triggers = {}
         
+        # Recent analyze() results, shared by callers checking the same message
+        self._analysis_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        
         # Define Twitter patterns once
         self.twitter_patterns = {
             'general': {
@@ -156,52 +163,55 @@ class TriggerDetector:
             ]
         }
 
+    @staticmethod
+    def _matches(message: str, triggers: Dict[str, List[str]]) -> bool:
+        """Check an already-lowercased message against keyword/phrase triggers"""
+        return any(keyword.lower() in message for keyword in triggers['keywords']) or \
+               any(phrase.lower() in message for phrase in triggers['phrases'])
+
+    def analyze(self, message: str) -> Dict[str, Any]:
+        """Run tool, memory and tool-type detection over a message in one pass"""
+        analysis = self._analysis_cache.get(message)
+        if analysis is not None:
+            self._analysis_cache.move_to_end(message)
+            return analysis
+            
+        lowered = message.lower()
+        analysis = {
+            'use_tools': self._should_use_tools(lowered),
+            'use_memory': self._matches(lowered, self.memory_triggers),
+            'tool_type': self._get_specific_tool_type(lowered)
+        }
+        
+        self._analysis_cache[message] = analysis
+        if len(self._analysis_cache) > self.ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+        return analysis
+
     def should_use_tools(self, message: str) -> bool:
         """Check if message should trigger tool usage"""
-        message = message.lower()
-        
-        for tool in self.tool_triggers.values():
-            # Check keywords
-            if any(keyword.lower() in message for keyword in tool['keywords']):
-                return True
-                
-            # Check phrases
-            if any(phrase.lower() in message for phrase in tool['phrases']):
-                return True
-                
-        return False
+        return self.analyze(message)['use_tools']
+
+    def _should_use_tools(self, message: str) -> bool:
+        return any(self._matches(message, tool) for tool in self.tool_triggers.values())
         
     def should_use_memory(self, message: str) -> bool:
         """Check if message should trigger memory lookup"""
-        message = message.lower()
-        
-        # Check memory keywords
-        if any(keyword.lower() in message for keyword in self.memory_triggers['keywords']):
-            return True
-            
-        # Check memory phrases
-        if any(phrase.lower() in message for phrase in self.memory_triggers['phrases']):
-            return True
-            
-        return False
+        return self.analyze(message)['use_memory']
 
     def should_use_twitter(self, message: str) -> bool:
         """Check if message is Twitter-related"""
-        message = message.lower()
-        
+        return self._should_use_twitter(message.lower())
+
+    def _should_use_twitter(self, message: str) -> bool:
         # Check all Twitter pattern categories
-        for category in self.twitter_patterns.values():
-            if any(keyword.lower() in message for keyword in category['keywords']) or \
-               any(phrase.lower() in message for phrase in category['phrases']):
-                return True
-                
-        return False
+        return any(self._matches(message, category) for category in self.twitter_patterns.values())
 
     def get_tool_operation_type(self, message: str) -> Optional[str]:
         """Determine specific Twitter operation type from message"""
         message = message.lower()
         
-        if not self.should_use_twitter(message):
+        if not self._should_use_twitter(message):
             return None
             
         # Check for scheduling patterns first (most specific)
@@ -239,15 +249,16 @@ class TriggerDetector:
 
     def get_specific_tool_type(self, message: str) -> Optional[str]:
         """Determine specific tool type needed"""
-        message = message.lower()
-        
+        return self.analyze(message)['tool_type']
+
+    def _get_specific_tool_type(self, message: str) -> Optional[str]:
         # Check for limit order patterns FIRST (most specific)
         if any(keyword.lower() in message for keyword in self.tool_triggers['intents']['keywords']) or \
            any(phrase.lower() in message for phrase in self.tool_triggers['intents']['phrases']):
             return ToolType.INTENTS.value  # Return proper enum value
         
         # Check Twitter patterns AFTER intents
-        if self.should_use_twitter(message):
+        if self._should_use_twitter(message):
             return ToolType.TWITTER.value  # Return proper enum value
         
         # Rest of the tool checks with proper enum values
@@ -48,6 +48,9 @@ class MockCollection:
         self.update_one = AsyncMock(return_value=MagicMock(modified_count=1))
         self.update_many = AsyncMock(return_value=MagicMock(modified_count=1))
         self.insert_one = AsyncMock(return_value=MagicMock(inserted_id=ObjectId()))
+        self.insert_many = AsyncMock(
+            side_effect=lambda docs, **kwargs: MagicMock(inserted_ids=[ObjectId() for _ in docs])
+        )
         self.delete_many = AsyncMock()
         self.find = AsyncMock()
         self.create_index = AsyncMock()
@@ -26,9 +26,18 @@ class MockCollection:
         self.update_one = AsyncMock()
         self.update_many = AsyncMock()
         self.insert_one = AsyncMock()
+        self.insert_many = AsyncMock(
+            side_effect=lambda docs, **kwargs: MagicMock(inserted_ids=[ObjectId() for _ in docs])
+        )
         self.delete_many = AsyncMock()
         self.find = AsyncMock()
 
+def mock_aggregate(collection, results):
+    """Make collection.aggregate() return a cursor yielding the given results"""
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=results)
+    collection.aggregate = MagicMock(return_value=cursor)
+
 class MockDB(RinDB):
     """Mock RinDB that matches the actual implementation"""
     def __init__(self):
@@ -262,10 +271,6 @@ async def test_create_tool_items(tool_state_manager):
         }
     ]
     
-    # Mock item creation responses
-    tool_state_manager.db.tool_items.insert_one.side_effect = [
-        MagicMock(inserted_id=ObjectId()) for _ in range(len(items_data))
-    ]
     
     items = await tool_state_manager.create_tool_items(
         session_id="test_session",
@@ -275,6 +280,7 @@ async def test_create_tool_items(tool_state_manager):
     )
     
     assert len(items) == 2
+    tool_state_manager.db.tool_items.insert_many.assert_awaited_once()
     for item in items:
         assert item["state"] == ToolOperationState.COLLECTING.value
         assert item["content_type"] == ContentType.TWEET.value
@@ -308,10 +314,6 @@ async def test_regeneration_workflow(tool_state_manager):
         }
     ]
     
-    tool_state_manager.db.tool_items.insert_one.side_effect = [
-        MagicMock(inserted_id=ObjectId()) for _ in range(len(new_items))
-    ]
-    
     regenerated_items = await tool_state_manager.create_regeneration_items(
         session_id="test_session",
         tool_operation_id=str(operation_id),
@@ -351,6 +353,41 @@ async def test_invalid_state_transition(tool_state_manager):
     
     assert "Invalid state transition" in str(exc_info.value)
 
+@pytest.mark.asyncio
+async def test_update_operation_with_stale_cache(tool_state_manager):
+    """Test a stale cached state is re-read before applying a transition"""
+    operation_id = ObjectId()
+    operation = {
+        "_id": operation_id,
+        "session_id": "test_session",
+        "state": ToolOperationState.COLLECTING.value,
+        "metadata": {},
+        "output_data": {}
+    }
+    tool_state_manager._cache_operation(str(operation_id), operation)
+
+    # Another writer already moved the stored operation on
+    tool_state_manager.db.tool_operations.find_one.return_value = {
+        **operation, "state": ToolOperationState.APPROVING.value
+    }
+    tool_state_manager.db.tool_operations.update_one.side_effect = [
+        MagicMock(modified_count=0),
+        MagicMock(modified_count=1)
+    ]
+
+    updated = await tool_state_manager.update_operation(
+        session_id="test_session",
+        tool_operation_id=str(operation_id),
+        state=ToolOperationState.EXECUTING.value
+    )
+
+    assert updated is True
+    stale_filter, fresh_filter = (
+        call.args[0] for call in tool_state_manager.db.tool_operations.update_one.call_args_list
+    )
+    assert stale_filter["state"] == ToolOperationState.COLLECTING.value
+    assert fresh_filter["state"] == ToolOperationState.APPROVING.value
+
 @pytest.mark.asyncio
 async def test_concurrent_operations(tool_state_manager):
     """Test handling multiple operations for the same session"""
@@ -410,4 +447,32 @@ async def test_error_handling(tool_state_manager):
     
     # Check both the custom message and original error
     error_msg = str(exc_info.value)
-    assert "Database error" in error_msg 
\ No newline at end of file
+    assert "Database error" in error_msg 
+
+@pytest.mark.asyncio
+async def test_validate_operation_items(tool_state_manager):
+    """Test validating pending items against the items linked to an operation"""
+    operation_id = str(ObjectId())
+    tool_state_manager.db.tool_items.name = "rin.tool_items"
+    
+    for results, expected in [([{"ok": True}], True), ([{"ok": False}], False), ([], False)]:
+        mock_aggregate(tool_state_manager.db.tool_operations, results)
+        assert await tool_state_manager.validate_operation_items(operation_id) is expected
+    
+    pipeline = tool_state_manager.db.tool_operations.aggregate.call_args.args[0]
+    lookup = next(stage["$lookup"] for stage in pipeline if "$lookup" in stage)
+    assert lookup["from"] == tool_state_manager.db.tool_items.name
+    assert lookup["pipeline"][0] == {"$match": {"tool_operation_id": operation_id}}
+
+@pytest.mark.asyncio
+async def test_validate_operation_items_without_pending_items(tool_state_manager):
+    """Test operations without pending_items compare as an empty list"""
+    tool_state_manager.db.tool_items.name = "rin.tool_items"
+    mock_aggregate(tool_state_manager.db.tool_operations, [{"ok": True}])
+    
+    assert await tool_state_manager.validate_operation_items(str(ObjectId())) is True
+    
+    pipeline = tool_state_manager.db.tool_operations.aggregate.call_args.args[0]
+    assert pipeline[1] == {
+        "$project": {"pending_items": {"$ifNull": ["$output_data.pending_items", []]}}
+    }
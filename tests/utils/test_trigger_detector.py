@@ -80,4 +80,44 @@ def test_edge_cases(trigger_detector):
     
     # Case insensitivity
     assert trigger_detector.get_specific_tool_type("TWEET THIS") == "twitter"
-    assert trigger_detector.get_specific_tool_type("Schedule TWEETS") == "twitter" 
\ No newline at end of file
+    assert trigger_detector.get_specific_tool_type("Schedule TWEETS") == "twitter" 
+
+def test_analyze_matches_individual_checks(trigger_detector):
+    """Test that analyze() agrees with the uncached trigger checks"""
+    messages = [
+        "schedule 5 tweets about AI",
+        "do you recall what we talked about?",
+        "what's the weather in Tokyo",
+        "create limit order to buy NEAR when price hits 5",
+        "normal chat message"
+    ]
+    
+    for message in messages:
+        analysis = trigger_detector.analyze(message)
+        lowered = message.lower()
+        assert analysis['use_tools'] == trigger_detector._should_use_tools(lowered)
+        assert analysis['use_memory'] == trigger_detector._matches(lowered, trigger_detector.memory_triggers)
+        assert analysis['tool_type'] == trigger_detector._get_specific_tool_type(lowered)
+    
+    # Fixed expectations, independent of analyze()
+    analysis = trigger_detector.analyze("schedule 5 tweets about AI")
+    assert analysis['use_tools'] is True
+    assert analysis['tool_type'] == "twitter"
+    assert trigger_detector.analyze("normal chat message")['tool_type'] is None
+    
+    # Repeated analysis of the same message reuses the previous result
+    assert trigger_detector.analyze("remember me") is trigger_detector.analyze("remember me")
+
+def test_analysis_cache_is_bounded(trigger_detector):
+    """Test that cached analyses are reused and evicted least-recently-used first"""
+    trigger_detector.ANALYSIS_CACHE_SIZE = 2
+    first = trigger_detector.analyze("hello there")
+    trigger_detector.analyze("what time is it")
+    
+    # Touching the first message keeps it over the second
+    assert trigger_detector.analyze("hello there") is first
+    trigger_detector.analyze("tweet this")
+    
+    assert len(trigger_detector._analysis_cache) == 2
+    assert "what time is it" not in trigger_detector._analysis_cache
+    assert trigger_detector.analyze("hello there") is first